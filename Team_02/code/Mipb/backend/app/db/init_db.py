@@ -1,45 +1,86 @@
-
-from sqlalchemy.orm import Session
-from .models import User, Base
-from .session import engine, SessionLocal
-
-# Initialize Database Tables
-Base.metadata.create_all(bind=engine)
-
-def init_db():
-    db = SessionLocal()
-    
-    # Check if users exist
-    if db.query(User).first():
-        print("Users already seeded.")
-        return
-
-    users_data = [
-        # Key Decision-Makers
-        {"username": "adam.rector", "full_name": "Adam Rector", "role_name": "Rector (RKR)"},
-        {"username": "carl.chancellor", "full_name": "Carl Chancellor", "role_name": "Chancellor (KAN)"},
-        {"username": "paula.bredu", "full_name": "Paula VREdu", "role_name": "Vice-Rector for Education (PRK)"},
-        {"username": "peter.vrsci", "full_name": "Peter VRSci", "role_name": "Vice-Rector for Scientific Affairs (PRN)"},
-        
-        # Departmental Roles
-        {"username": "holly.head", "full_name": "Holly Head", "role_name": "Head of O.U."},
-        {"username": "penny.personnel", "full_name": "Penny Personnel", "role_name": "PD (Personnel Department)"},
-        {"username": "quentin.quartermaster", "full_name": "Quentin Quartermaster", "role_name": "Quartermaster (KWE)"},
-        {"username": "mike.mpd", "full_name": "Mike MPD", "role_name": "MPD (Military Personnel Dept.)"},
-        
-        # Employee Personas (also act as Initiators/Requesters)
-        {"username": "alice.academic", "full_name": "Alice Academic", "role_name": "Academic Teacher"},
-        {"username": "nancy.nonacademic", "full_name": "Nancy NonAcademic", "role_name": "Non-Academic Employee"},
-    ]
-
-    for u in users_data:
-        user = User(username=u["username"], full_name=u["full_name"], role_name=u["role_name"])
-        db.add(user)
-    
-    db.commit()
-    print("Users seeded successfully.")
-    db.close()
-
-if __name__ == "__main__":
-    print("Initializing Database...")
-    init_db()
+
+from sqlalchemy import func, inspect, select, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateColumn
+from .models import User, Base
+from .pool import env_flag
+from .session import engine, SessionLocal
+
+# Every worker migrates at startup (one at a time); set to false to run `python -m app.db.init_db` as a separate step
+MIGRATE_ON_STARTUP = env_flag("DB_MIGRATE_ON_STARTUP", "true")
+# pg_advisory_xact_lock key that serializes migrate() across workers and replicas
+MIGRATION_LOCK_ID = 7_304_112
+
+# Replaced by ix_history_logs_instance_id_id / ix_archived_history_logs_instance_id_id (history pages by id)
+OBSOLETE_INDEXES = ("ix_history_logs_instance_timestamp_id", "ix_archived_history_logs_instance_timestamp_id")
+
+# create_all skips existing tables, so add columns and indexes introduced after the first deploy
+def upgrade_schema(conn):
+    existing = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        present = {c["name"]: c["type"] for c in existing.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in present:
+                ddl = CreateColumn(column).compile(dialect=conn.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+            elif isinstance(column.type.dialect_impl(conn.dialect), JSONB) and not isinstance(present[column.name], JSONB):
+                # json -> jsonb (before the GIN index below is created)
+                conn.execute(text(f"ALTER TABLE {table.name} ALTER COLUMN {column.name} TYPE jsonb USING {column.name}::jsonb"))
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=conn, checkfirst=True)
+    for name in OBSOLETE_INDEXES:
+        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+def migrate():
+    """Create missing tables and apply upgrade_schema in one transaction.
+
+    On Postgres the transaction first takes an advisory lock, so workers
+    starting together upgrade one after another and each sees the columns
+    the previous one added instead of failing on a duplicate column.
+    """
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(select(func.pg_advisory_xact_lock(MIGRATION_LOCK_ID)))
+        Base.metadata.create_all(bind=conn)
+        upgrade_schema(conn)
+
+def init_db():
+    db = SessionLocal()
+    
+    # Check if users exist
+    if db.query(User).first():
+        print("Users already seeded.")
+        return
+
+    users_data = [
+        # Key Decision-Makers
+        {"username": "adam.rector", "full_name": "Adam Rector", "role_name": "Rector (RKR)"},
+        {"username": "carl.chancellor", "full_name": "Carl Chancellor", "role_name": "Chancellor (KAN)"},
+        {"username": "paula.bredu", "full_name": "Paula VREdu", "role_name": "Vice-Rector for Education (PRK)"},
+        {"username": "peter.vrsci", "full_name": "Peter VRSci", "role_name": "Vice-Rector for Scientific Affairs (PRN)"},
+        
+        # Departmental Roles
+        {"username": "holly.head", "full_name": "Holly Head", "role_name": "Head of O.U."},
+        {"username": "penny.personnel", "full_name": "Penny Personnel", "role_name": "PD (Personnel Department)"},
+        {"username": "quentin.quartermaster", "full_name": "Quentin Quartermaster", "role_name": "Quartermaster (KWE)"},
+        {"username": "mike.mpd", "full_name": "Mike MPD", "role_name": "MPD (Military Personnel Dept.)"},
+        
+        # Employee Personas (also act as Initiators/Requesters)
+        {"username": "alice.academic", "full_name": "Alice Academic", "role_name": "Academic Teacher"},
+        {"username": "nancy.nonacademic", "full_name": "Nancy NonAcademic", "role_name": "Non-Academic Employee"},
+    ]
+
+    for u in users_data:
+        user = User(username=u["username"], full_name=u["full_name"], role_name=u["role_name"])
+        db.add(user)
+    
+    db.commit()
+    print("Users seeded successfully.")
+    db.close()
+
+if __name__ == "__main__":
+    print("Initializing Database...")
+    migrate()
+    init_db()
@@ -1,56 +1,212 @@
-
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean, func
-from sqlalchemy.orm import relationship
-from .session import Base
-import datetime
-
-class User(Base):
-    __tablename__ = "users"
-    id = Column(Integer, primary_key=True, index=True)
-    username = Column(String, unique=True, index=True)
-    full_name = Column(String)
-    role_name = Column(String)  # 'Rector', 'Head of O.U.', etc.
-
-class ProcessInstance(Base):
-    __tablename__ = "process_instances"
-    id = Column(Integer, primary_key=True, index=True)
-    process_definition_key = Column(String, index=True)  # 'leave_request', etc.
-    status = Column(String, default="ACTIVE") # ACTIVE, COMPLETED, REJECTED
-    requester_id = Column(Integer, ForeignKey("users.id"))
-    created_at = Column(DateTime, default=func.now())
-    variables = Column(JSON, default={})
-    
-    requester = relationship("User")
-    tasks = relationship("Task", back_populates="process_instance")
-    history_logs = relationship("HistoryLog", back_populates="process_instance")
-
-class Task(Base):
-    __tablename__ = "tasks"
-    id = Column(Integer, primary_key=True, index=True)
-    process_instance_id = Column(Integer, ForeignKey("process_instances.id"))
-    task_definition_key = Column(String) # Task ID from BPMN
-    name = Column(String) # Human readable name
-    
-    # Assignment
-    assignee_role = Column(String, nullable=True) # Assigned to a group/role
-    assignee_user_id = Column(Integer, ForeignKey("users.id"), nullable=True) # Direct assignment (optional)
-    
-    status = Column(String, default="PENDING") # PENDING, COMPLETED
-    created_at = Column(DateTime, default=func.now())
-
-    process_instance = relationship("ProcessInstance", back_populates="tasks")
-    assignee_user = relationship("User")
-
-class HistoryLog(Base):
-    __tablename__ = "history_logs"
-    id = Column(Integer, primary_key=True, index=True)
-    process_instance_id = Column(Integer, ForeignKey("process_instances.id"))
-    task_id = Column(Integer, ForeignKey("tasks.id"), nullable=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    user_name = Column(String, nullable=True) # Snapshot name
-    action = Column(String) # START_PROCESS, COMPLETE_TASK, REJECT_APP...
-    comment = Column(Text, nullable=True)
-    timestamp = Column(DateTime, default=func.now())
-
-    process_instance = relationship("ProcessInstance", back_populates="history_logs")
-    user = relationship("User")
+
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Float, ForeignKey, JSON, Boolean, Index, Table, UniqueConstraint, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql.expression import FunctionElement
+from .session import Base
+import datetime
+
+# JSONB on Postgres: GIN-indexed variable search and in-place `||` merges (see ProcessEngine).
+# none_as_null: Python None is stored as SQL NULL, not JSON 'null', so IS NULL filters work.
+VariablesType = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
+class db_now(FunctionElement):
+    """The clock behind the func.now() column defaults, as the naive value they store.
+
+    Durations measured against created_at/timestamp must take their other end
+    from here: the database session's time zone need not be UTC.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+@compiles(db_now)
+def compile_db_now(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"  # SQLite: UTC, what func.now() stores
+
+@compiles(db_now, "postgresql")
+def compile_db_now_postgresql(element, compiler, **kw):
+    return "LOCALTIMESTAMP"  # now() without time zone, as stored in a timestamp column
+
+class User(Base):
+    __tablename__ = "users"
+    id = Column(Integer, primary_key=True, index=True)
+    username = Column(String, unique=True, index=True)
+    full_name = Column(String)
+    role_name = Column(String)  # 'Rector', 'Head of O.U.', etc.
+
+# Tables archived by app/services/archive.py: SQLite must not hand out the ids of
+# archived rows again (rowid reuse), or they would collide in the archived_* tables
+HOT_TABLE_OPTIONS = {"sqlite_autoincrement": True}
+
+class ProcessInstance(Base):
+    __tablename__ = "process_instances"
+    id = Column(Integer, primary_key=True, index=True)
+    process_definition_key = Column(String, index=True)  # 'leave_request', etc.
+    status = Column(String, default="ACTIVE") # ACTIVE, COMPLETED, REJECTED
+    requester_id = Column(Integer, ForeignKey("users.id"))
+    created_at = Column(DateTime, default=func.now())
+    ended_at = Column(DateTime, nullable=True)  # set with the final status; archived after ARCHIVE_AFTER_DAYS
+    variables = Column(VariablesType, default={})
+    version = Column(Integer, nullable=False, default=1, server_default="1") # optimistic concurrency
+    deltas_since_checkpoint = Column(Integer, nullable=False, default=0, server_default="0") # see variable_history.py
+    
+    requester = relationship("User")
+    tasks = relationship("Task", back_populates="process_instance")
+    history_logs = relationship("HistoryLog", back_populates="process_instance")
+
+    __table_args__ = (
+        # Archive/instance listing: status filter paged by id, date-range filter
+        Index("ix_process_instances_status_id", "status", "id"),
+        Index("ix_process_instances_created_at", "created_at"),
+        # /instances/search: `variables @> '{"is_academic": true}'` on any variable
+        Index("ix_process_instances_variables", "variables", postgresql_using="gin",
+              postgresql_ops={"variables": "jsonb_path_ops"}).ddl_if(dialect="postgresql"),
+        HOT_TABLE_OPTIONS,
+    )
+    # UPDATEs become "... WHERE id = :id AND version = :seen"; a lost race raises StaleDataError
+    __mapper_args__ = {"version_id_col": version}
+
+class Task(Base):
+    __tablename__ = "tasks"
+    id = Column(Integer, primary_key=True, index=True)
+    process_instance_id = Column(Integer, ForeignKey("process_instances.id"))
+    task_definition_key = Column(String) # Task ID from BPMN
+    name = Column(String) # Human readable name
+    
+    # Assignment
+    assignee_role = Column(String, nullable=True) # Assigned to a group/role
+    assignee_user_id = Column(Integer, ForeignKey("users.id"), nullable=True) # Direct assignment (optional)
+    
+    status = Column(String, default="PENDING") # PENDING, COMPLETED, FAILED (service task out of retries)
+    created_at = Column(DateTime, default=func.now())
+
+    # Service tasks (automatic steps): handler name, runs so far, not to be run before run_after
+    handler = Column(String, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    run_after = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    # SLA: escalated by app/services/sla.py once due_at has passed
+    due_at = Column(DateTime, nullable=True)
+    escalation_level = Column(Integer, nullable=False, default=0, server_default="0")
+
+    process_instance = relationship("ProcessInstance", back_populates="tasks")
+    assignee_user = relationship("User")
+
+    __table_args__ = (
+        # Worklist: pending tasks by role / by direct assignee, paged by id
+        Index("ix_tasks_status_role_id", "status", "assignee_role", "id"),
+        Index("ix_tasks_status_user_id", "status", "assignee_user_id", "id"),
+        # Claim queue: oldest unclaimed pending task of a role
+        Index("ix_tasks_claimable_role_id", "assignee_role", "id",
+              postgresql_where=text("status = 'PENDING' AND assignee_user_id IS NULL"),
+              sqlite_where=text("status = 'PENDING' AND assignee_user_id IS NULL")),
+        # Escalation scheduler: range scan over overdue pending tasks only
+        Index("ix_tasks_pending_due_at", "due_at", "id",
+              postgresql_where=text("status = 'PENDING' AND due_at IS NOT NULL"),
+              sqlite_where=text("status = 'PENDING' AND due_at IS NOT NULL")),
+        # Service-task workers: due automatic tasks
+        Index("ix_tasks_service_due", "run_after", "id",
+              postgresql_where=text("status = 'PENDING' AND handler IS NOT NULL"),
+              sqlite_where=text("status = 'PENDING' AND handler IS NOT NULL")),
+        HOT_TABLE_OPTIONS,
+    )
+
+class HistoryLog(Base):
+    __tablename__ = "history_logs"
+    id = Column(Integer, primary_key=True, index=True)
+    process_instance_id = Column(Integer, ForeignKey("process_instances.id"))
+    task_id = Column(Integer, ForeignKey("tasks.id"), nullable=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    user_name = Column(String, nullable=True) # Snapshot name
+    action = Column(String) # START_PROCESS, COMPLETE_TASK, REJECT_APP...
+    comment = Column(Text, nullable=True)
+    timestamp = Column(DateTime, default=func.now())
+    # Variables changed by this step; every few steps also the full variables (checkpoint)
+    variables_delta = Column(VariablesType, nullable=True)
+    variables_checkpoint = Column(VariablesType, nullable=True)
+
+    process_instance = relationship("ProcessInstance", back_populates="history_logs")
+    user = relationship("User")
+
+    __table_args__ = (
+        # History of one instance in commit (id) order
+        Index("ix_history_logs_instance_id_id", "process_instance_id", "id"),
+        HOT_TABLE_OPTIONS,
+    )
+
+def archive_of(model, *indexes):
+    """Cold copy of a hot table for app/services/archive.py: same columns and ids, no foreign keys or defaults."""
+    table = model.__table__
+    return Table(
+        f"archived_{table.name}", Base.metadata,
+        *(Column(c.name, c.type, primary_key=c.primary_key, nullable=c.nullable) for c in table.columns),
+        *indexes,
+    )
+
+# Finished instances older than ARCHIVE_AFTER_DAYS, moved out of the hot tables with their tasks and history
+archived_process_instances = archive_of(
+    ProcessInstance,
+    Index("ix_archived_process_instances_status_id", "status", "id"),
+    Index("ix_archived_process_instances_created_at", "created_at"),
+)
+archived_tasks = archive_of(Task, Index("ix_archived_tasks_process_instance_id", "process_instance_id"))
+archived_history_logs = archive_of(
+    HistoryLog, Index("ix_archived_history_logs_instance_id_id", "process_instance_id", "id"),
+)
+
+class ProcessKpi(Base):
+    """Completions and their durations per (definition, task, role, day), kept up to date by ProcessEngine.
+
+    Whole instances (start to end) are counted under task_definition_key ""
+    and the end status as assignee_role. See app/services/kpi.py.
+    """
+    __tablename__ = "process_kpis"
+    id = Column(Integer, primary_key=True)
+    process_definition_key = Column(String, nullable=False)
+    task_definition_key = Column(String, nullable=False)
+    assignee_role = Column(String, nullable=False)  # "" for automatic steps
+    day = Column(Date, nullable=False)  # day of the completion on the database clock (db_now)
+
+    count = Column(Integer, nullable=False, default=0)
+    duration_sum = Column(Float, nullable=False, default=0.0)  # seconds
+    duration_min = Column(Float, nullable=True)
+    duration_max = Column(Float, nullable=True)
+    # Duration sketch: completions per bucket (kpi.DURATION_BUCKETS), for percentile estimates
+    under_1h = Column(Integer, nullable=False, default=0, server_default="0")
+    under_4h = Column(Integer, nullable=False, default=0, server_default="0")
+    under_8h = Column(Integer, nullable=False, default=0, server_default="0")
+    under_1d = Column(Integer, nullable=False, default=0, server_default="0")
+    under_3d = Column(Integer, nullable=False, default=0, server_default="0")
+    under_1w = Column(Integer, nullable=False, default=0, server_default="0")
+    under_2w = Column(Integer, nullable=False, default=0, server_default="0")
+    under_30d = Column(Integer, nullable=False, default=0, server_default="0")
+    over_30d = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        # Upsert target; dashboards filter by definition and day range
+        UniqueConstraint("process_definition_key", "day", "task_definition_key", "assignee_role",
+                         name="uq_process_kpis_key"),
+    )
+
+class IdempotencyKey(Base):
+    """Response of a start/complete request, replayed when the client retries with the same Idempotency-Key.
+
+    Inserted in the same transaction as the engine operation (see app/services/idempotency.py).
+    """
+    __tablename__ = "idempotency_keys"
+    id = Column(Integer, primary_key=True)
+    scope = Column(String, nullable=False)  # endpoint: "start", "complete"
+    key = Column(String, nullable=False)
+    fingerprint = Column(String(64), nullable=False)  # sha256 of the request, a reused key must match
+    status_code = Column(Integer, nullable=False)
+    response = Column(JSON, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        # A concurrent duplicate fails on this constraint and rolls its whole transaction back
+        UniqueConstraint("scope", "key", name="uq_idempotency_keys_scope_key"),
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
@@ -0,0 +1,110 @@
+import os
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+from app.services.metrics import Histogram, Counters
+
+# name -> PoolMetrics, reported by /api/metrics
+POOL_METRICS = {}
+# Seconds a SQLite connection waits for another writer's lock before "database is locked"
+SQLITE_BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", "30"))
+
+
+def env_flag(name, default="false"):
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+
+def pool_options(url):
+    """Pool settings from the environment (DB_POOL_*), next to DATABASE_URL."""
+    if make_url(url).get_backend_name() == "sqlite":
+        # SQLite uses its own single-file/in-memory pools
+        return {"connect_args": {"timeout": SQLITE_BUSY_TIMEOUT}}
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "-1")),
+        "pool_pre_ping": env_flag("DB_POOL_PRE_PING"),
+    }
+
+
+class PoolMetrics:
+    def __init__(self, name):
+        self.name = name
+        self.pool = None
+        self.wait_seconds = Histogram()
+        self.counters = Counters("connects", "checkouts", "checkins", "invalidations", "checkout_timeouts")
+
+    def attach(self, engine):
+        # Counters come from pool events; wait time/timeouts from InstrumentedPool.connect
+        self.pool = getattr(engine, "sync_engine", engine).pool
+        self.pool.metrics = self
+        for name in ("connect", "checkout", "checkin", "invalidate"):
+            event.listen(self.pool, name, self.listener(name))
+        return engine
+
+    def listener(self, name):
+        counter = {"connect": "connects", "checkout": "checkouts",
+                   "checkin": "checkins", "invalidate": "invalidations"}[name]
+        return lambda *args: self.counters.inc(counter)
+
+    def snapshot(self):
+        pool = self.pool
+        status = {}
+        if pool is not None and hasattr(pool, "checkedout"):
+            status = {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": pool.overflow(),
+            }
+        return {
+            "pool": type(pool).__name__ if pool is not None else None,
+            **status,
+            **self.counters.snapshot(),
+            "checkout_wait_seconds": self.wait_seconds.snapshot(),
+        }
+
+
+class InstrumentedPool:
+    """Mixin timing every checkout, including time spent waiting for a free connection."""
+
+    metrics = None
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            if self.metrics:
+                self.metrics.counters.inc("checkout_timeouts")
+            raise
+        finally:
+            if self.metrics:
+                self.metrics.wait_seconds.observe(time.perf_counter() - start)
+
+    def recreate(self):
+        new_pool = super().recreate()
+        new_pool.metrics = self.metrics
+        if self.metrics:
+            self.metrics.pool = new_pool
+        return new_pool
+
+
+class InstrumentedQueuePool(InstrumentedPool, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedPool, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrumented(engine_factory, url, name, poolclass, **kwargs):
+    options = pool_options(url)
+    if "pool_size" in options:
+        options["poolclass"] = poolclass
+    metrics = POOL_METRICS[name] = PoolMetrics(name)
+    return metrics.attach(engine_factory(url, **options, **kwargs))
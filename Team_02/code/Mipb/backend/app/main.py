@@ -1,33 +1,72 @@
-
-from fastapi import FastAPI
-from contextlib import asynccontextmanager
-from app.db.init_db import init_db
-
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    # Startup: Init DB
-    try:
-        init_db()
-    except Exception as e:
-        print(f"DB Init failed (might be expected if DB not ready): {e}")
-    yield
-
-from app.routers import process, auth
-from fastapi.middleware.cors import CORSMiddleware
-
-app = FastAPI(title="MPP Backend", lifespan=lifespan)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-app.include_router(process.router, prefix="/api/process", tags=["process"])
-app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
-
-@app.get("/")
-def read_root():
-    return {"message": "MPP Backend is online"}
+
+from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from app.db.init_db import init_db, migrate, MIGRATE_ON_STARTUP
+from app.services.bpmn_loader import get_process_models
+from app.services.task_events import task_events
+from app.services.service_tasks import service_workers
+from app.services.sla import escalation_scheduler
+from app.services.archive import archive_job
+from app.services.idempotency import expired_key_purge
+from app.db.session import async_engine, ASYNC_DATABASE_URL
+from sqlalchemy.engine import make_url
+import asyncio
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup: Compile BPMN models once (fails fast on a broken diagram)
+    get_process_models()
+    # Startup: create/upgrade the tables (fails fast), unless migrated as a separate step
+    if MIGRATE_ON_STARTUP:
+        migrate()
+    # Startup: Init DB
+    try:
+        init_db()
+    except Exception as e:
+        print(f"DB Init failed (might be expected if DB not ready): {e}")
+    # Startup: Receive task events from all workers (Postgres LISTEN/NOTIFY)
+    listener = None
+    if async_engine.dialect.name == "postgresql":
+        dsn = make_url(ASYNC_DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+        listener = asyncio.create_task(task_events.listen(dsn))
+    # Startup: Workers for automatic (service) steps
+    service_workers.start()
+    # Startup: SLA escalation of overdue tasks
+    escalation_scheduler.start()
+    # Startup: move old finished instances to the archive tables
+    archive_job.start()
+    # Startup: drop Idempotency-Key responses past their TTL
+    expired_key_purge.start()
+    yield
+    await expired_key_purge.stop()
+    await archive_job.stop()
+    await escalation_scheduler.stop()
+    await service_workers.stop()
+    if listener:
+        listener.cancel()
+
+from app.routers import process, auth, metrics, analytics
+from app.services.pagination import NEXT_CURSOR_HEADER
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+
+# orjson renders every dict/list response (several times faster than json.dumps on large payloads)
+app = FastAPI(title="MPP Backend", lifespan=lifespan, default_response_class=ORJSONResponse)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
+)
+
+app.include_router(process.router, prefix="/api/process", tags=["process"])
+app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
+app.include_router(metrics.router, prefix="/api/metrics", tags=["metrics"])
+app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
+
+@app.get("/")
+def read_root():
+    return {"message": "MPP Backend is online"}
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.read_routing import get_read_db
+from app.services.kpi import kpi_summary
+from typing import Optional
+import datetime
+
+router = APIRouter()
+
+# ?by= -> ProcessKpi columns the daily task rows are summed by
+GROUPINGS = {
+    "task": ("process_definition_key", "task_definition_key", "assignee_role"),
+    "role": ("assignee_role",),
+    "day": ("process_definition_key", "day"),
+}
+
+@router.get("/kpis")
+async def get_kpis(
+    by: str = "task",
+    process_key: Optional[str] = None,
+    date_from: Optional[datetime.date] = None,
+    date_to: Optional[datetime.date] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Time spent per task / role / day and instance cycle times, from the pre-aggregated process_kpis table."""
+    if by not in GROUPINGS:
+        raise HTTPException(status_code=400, detail=f"by must be one of: {', '.join(GROUPINGS)}")
+    tasks = await kpi_summary(db, GROUPINGS[by], process_key, date_from, date_to)
+    instances = await kpi_summary(db, ("process_definition_key", "assignee_role"), process_key, date_from, date_to,
+                                  instances=True)
+    for row in instances:
+        row["end_status"] = row.pop("assignee_role")
+    return {"by": by, "tasks": tasks, "instances": instances}
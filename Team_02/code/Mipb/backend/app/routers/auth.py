@@ -1,20 +1,20 @@
-
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.db.models import User
-from pydantic import BaseModel
-from typing import List
-
-router = APIRouter()
-
-class UserSchema(BaseModel):
-    id: int
-    username: str
-    full_name: str
-    role_name: str
-
-@router.get("/users", response_model=List[UserSchema])
-def get_users(db: Session = Depends(get_db)):
-    users = db.query(User).all()
-    return users
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.read_routing import get_read_db
+from app.services.user_directory import user_directory
+from pydantic import BaseModel
+from typing import List
+
+router = APIRouter()
+
+class UserSchema(BaseModel):
+    id: int
+    username: str
+    full_name: str
+    role_name: str
+
+@router.get("/users", response_model=List[UserSchema])
+async def get_users(db: AsyncSession = Depends(get_read_db)):
+    users = await user_directory.aall(db)
+    return [u._asdict() for u in users]
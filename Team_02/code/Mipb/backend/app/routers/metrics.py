@@ -0,0 +1,25 @@
+from fastapi import APIRouter
+from app.db.pool import POOL_METRICS
+from app.services.user_directory import user_directory
+from app.services.worklist_cache import worklist_cache
+from app.services.profiling import engine_stats
+from app.services.service_tasks import service_workers
+from app.services.sla import escalation_scheduler
+from app.services.archive import archive_job
+from app.services.idempotency import expired_key_purge
+from app.services import read_routing
+
+router = APIRouter()
+
+@router.get("")
+async def get_metrics():
+    return {
+        "pools": {name: m.snapshot() for name, m in POOL_METRICS.items()},
+        "caches": {"users": user_directory.snapshot(), "worklists": worklist_cache.snapshot()},
+        "engine": engine_stats.snapshot(),
+        "service_tasks": service_workers.snapshot(),
+        "escalations": escalation_scheduler.snapshot(),
+        "archive": archive_job.snapshot(),
+        "idempotency_keys": expired_key_purge.snapshot(),
+        "read_routing": read_routing.snapshot(),
+    }
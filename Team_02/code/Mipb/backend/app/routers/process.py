@@ -1,101 +1,420 @@
-
-from fastapi import APIRouter, Depends, HTTPException, Body
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.db.models import ProcessInstance, Task, User, HistoryLog
-from app.services.process_engine import ProcessEngine
-from pydantic import BaseModel
-from typing import List, Optional, Any
-
-router = APIRouter()
-
-class ProcessStartRequest(BaseModel):
-    process_key: str
-    user_id: int
-    initial_data: dict
-
-class TaskCompleteRequest(BaseModel):
-    user_id: int
-    data: dict
-
-class TaskResponse(BaseModel):
-    id: int
-    name: str
-    task_definition_key: str
-    assignee_role: Optional[str]
-    created_at: Any
-    process_instance_id: int
-    process_definition_key: str
-    variables: dict
-
-class HistoryResponse(BaseModel):
-    action: str
-    user_name: Optional[str]
-    comment: Optional[str]
-    timestamp: Any
-    variables_snapshot: Optional[dict] = None
-
-@router.post("/start")
-def start_process(req: ProcessStartRequest, db: Session = Depends(get_db)):
-    engine = ProcessEngine(db)
-    instance = engine.start_process(req.process_key, req.user_id, req.initial_data)
-    return {"status": "started", "id": instance.id}
-
-@router.get("/tasks/{user_id}", response_model=List[TaskResponse])
-def get_my_tasks(user_id: int, db: Session = Depends(get_db)):
-    # Logic: Get tasks assigned to user OR assigned to user's Role
-    user = db.query(User).get(user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    tasks = db.query(Task).join(ProcessInstance).filter(
-        Task.status == "PENDING"
-    ).filter(
-        (Task.assignee_user_id == user_id) | (Task.assignee_role == user.role_name)
-    ).all()
-    
-    res = []
-    for t in tasks:
-        res.append({
-            "id": t.id,
-            "name": t.name,
-            "task_definition_key": t.task_definition_key,
-            "assignee_role": t.assignee_role,
-            "created_at": t.created_at,
-            "process_instance_id": t.process_instance_id,
-            "process_definition_key": t.process_instance.process_definition_key,
-            "variables": t.process_instance.variables
-        })
-    return res
-
-@router.post("/tasks/{task_id}/complete")
-def complete_task(task_id: int, req: TaskCompleteRequest, db: Session = Depends(get_db)):
-    engine = ProcessEngine(db)
-    instance = engine.complete_task(task_id, req.user_id, req.data)
-    return {"status": "completed"}
-
-@router.get("/history/{process_id}", response_model=dict)
-def get_history(process_id: int, db: Session = Depends(get_db)):
-    logs = db.query(HistoryLog).filter(HistoryLog.process_instance_id == process_id).order_by(HistoryLog.timestamp).all()
-    instance = db.query(ProcessInstance).get(process_id)
-    
-    serialized_logs = []
-    for log in logs:
-        serialized_logs.append({
-            "action": log.action,
-            "user_name": log.user_name,
-            "comment": log.comment,
-            "timestamp": log.timestamp,
-            "variables_snapshot": None # or log.variables_snapshot if added to model later
-        })
-
-    return {
-        "logs": serialized_logs,
-        "final_variables": instance.variables,
-        "status": instance.status
-    }
-
-@router.get("/instances")
-def list_instances(db: Session = Depends(get_db)):
-    instances = db.query(ProcessInstance).all()
-    return instances
+
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request, Response, UploadFile, File
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, func, type_coerce, union_all
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db, ReadSessionLocal
+from app.db.models import ProcessInstance, Task, HistoryLog, archived_process_instances, archived_history_logs
+from app.services.process_engine import AsyncProcessEngine, TaskNotFound, TaskNotPending, ConcurrencyConflict, UserNotFound
+from app.services.user_directory import user_directory
+from app.services.task_events import task_events
+from app.services.bulk_import import import_instances, read_payloads, DEFAULT_BATCH_SIZE
+from app.services.worklist_cache import worklist_cache, pending_tasks_query, WORKLIST_COLUMNS
+from app.services.bpmn_loader import get_process_models, outcomes, resolve, TaskStep
+from app.services.variable_history import variable_snapshots
+from app.services.read_routing import get_read_db
+from app.services.idempotency import run_idempotent, fingerprint, KeyReused
+from app.services.serialization import row_dicts, check_fields, json_response
+from app.services.pagination import keyset_select, split_page, page_items, NEXT_CURSOR_HEADER, MAX_PAGE_SIZE
+from pydantic import BaseModel, Field
+from typing import List, Optional
+import asyncio
+import datetime
+import json
+import orjson
+
+router = APIRouter()
+
+MAX_BATCH_SIZE = 1000
+STREAM_BATCH_SIZE = 1000
+SSE_HEARTBEAT_SECONDS = 15
+
+class ProcessStartRequest(BaseModel):
+    process_key: str
+    user_id: int
+    initial_data: dict
+
+class TaskCompleteRequest(BaseModel):
+    user_id: int
+    data: dict
+
+class TaskBatchItem(BaseModel):
+    task_id: int
+    data: dict = {}
+
+class TaskBatchCompleteRequest(BaseModel):
+    user_id: int
+    items: List[TaskBatchItem] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+class TaskResponse(BaseModel):
+    id: int
+    name: str
+    task_definition_key: str
+    assignee_role: Optional[str]
+    assignee_user_id: Optional[int] = None
+    created_at: Optional[datetime.datetime]
+    due_at: Optional[datetime.datetime] = None
+    process_instance_id: int
+    process_definition_key: str
+    variables: dict
+
+class TaskClaimRequest(BaseModel):
+    user_id: int
+
+class TaskDetailResponse(TaskResponse):
+    status: str
+    next_actions: List[dict]
+
+class HistoryResponse(BaseModel):
+    action: str
+    user_name: Optional[str]
+    comment: Optional[str]
+    timestamp: Optional[datetime.datetime]
+    variables_delta: Optional[dict] = None
+    variables_snapshot: Optional[dict] = None  # not a column: replayed by variable_snapshots
+
+class HistoryPageResponse(BaseModel):
+    logs: List[HistoryResponse]
+    final_variables: Optional[dict]
+    status: str
+    next_cursor: Optional[str] = None
+
+# The worklist and history are rendered straight from these projections (json_response)
+check_fields(TaskResponse, [column.key for column in WORKLIST_COLUMNS])
+HISTORY_FIELDS = ("action", "user_name", "comment", "timestamp", "variables_delta")
+check_fields(HistoryResponse, HISTORY_FIELDS + ("variables_snapshot",))
+
+def next_actions(process_key, task_key, variables):
+    # Where completing the task can lead, per gateway decision, from the compiled BPMN model
+    transition = get_process_models().next(process_key, task_key)
+    selected = resolve(transition, variables)
+    actions = []
+    for decisions, step in outcomes(transition):
+        actions.append({
+            "conditions": [
+                {"gateway": branch.gateway, "variable": branch.variable, "expected": branch.expected,
+                 "default": branch.default, "outcome": "yes" if took_yes else "no"}
+                for branch, took_yes in decisions
+            ],
+            "type": "task" if isinstance(step, TaskStep) else "end",
+            "key": step.key,
+            "name": step.name if isinstance(step, TaskStep) else None,
+            "assignee_role": step.role if isinstance(step, TaskStep) else None,
+            "end_status": None if isinstance(step, TaskStep) else step.status,
+            "selected": step == selected,  # outcome with the instance's current variables
+        })
+    return actions
+
+def worklist_query(user, cursor=None, limit=None):
+    """Pending tasks assigned to the user or unclaimed in their role, the keyset page after `cursor` in id order.
+
+    An OR of the two has no index in id order (it ends in a sort of the whole
+    queue), so each half is paged on its own index (ix_tasks_status_user_id,
+    ix_tasks_claimable_role_id) and only the 2 x (limit + 1) rows are merged.
+    """
+    # Role tasks once claimed by a colleague (assignee_user_id set) leave the shared queue
+    halves = [
+        pending_tasks_query().where(Task.assignee_user_id == user.id),
+        pending_tasks_query().where(Task.assignee_role == user.role_name, Task.assignee_user_id.is_(None)),
+    ]
+    merged = union_all(*(keyset_select(half, [Task.id], cursor, limit).subquery().select() for half in halves)).subquery()
+    return keyset_select(select(merged), [merged.c.id], limit=limit)
+
+async def paginate(db, stmt, order_by, cursor, limit, response=None, scalars=False):
+    try:
+        stmt = keyset_select(stmt, order_by, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    result = await db.execute(stmt)
+    rows, next_cursor = split_page((result.scalars() if scalars else result).all(), order_by, limit)
+    if next_cursor and response is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows, next_cursor
+
+async def idempotent(db, scope, key, request, operation, respond):
+    # Idempotency-Key header: a retried request gets the first response instead of running twice
+    try:
+        return await run_idempotent(db, scope, key, fingerprint(request), operation, respond)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except KeyReused as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+@router.post("/start")
+async def start_process(
+    req: ProcessStartRequest,
+    idempotency_key: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await idempotent(
+        db, "start", idempotency_key, req.model_dump(),
+        lambda engine: engine.start_process(req.process_key, req.user_id, req.initial_data),
+        lambda instance: {"status": "started", "id": instance.id},
+    )
+
+@router.post("/start/bulk")
+async def start_processes_bulk(
+    file: UploadFile = File(...),
+    format: str = Query("jsonl", pattern="^(jsonl|csv)$"),
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=50000),
+    db: AsyncSession = Depends(get_async_db),
+):
+    # Streams the upload; each batch is a multi-row INSERT ... RETURNING plus bulk task/history inserts
+    return await db.run_sync(lambda s: import_instances(s, read_payloads(file.file, format), batch_size))
+
+@router.get("/tasks/{user_id}", response_model=List[TaskResponse])
+async def get_my_tasks(
+    user_id: int,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    # Logic: Get tasks assigned to user OR assigned to user's Role
+    user = await user_directory.aget(db, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    # Served from the per-role/per-user cache; queues too long to cache are paged in SQL.
+    # A reload right after a task event reads the primary (get_read_db), so the replica's lag is never cached.
+    cached = await worklist_cache.worklist(db, user)
+    if cached is None:
+        try:
+            stmt = worklist_query(user, cursor, limit)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        rows, next_cursor = split_page((await db.execute(stmt)).all(), [Task.id], limit)
+    else:
+        try:
+            rows, next_cursor = page_items(cached, [Task.id], cursor, limit)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return json_response(row_dicts(rows), headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None)
+
+async def task_detail(db, task_id):
+    # Primary-key lookup joined to its instance: cost does not depend on queue length
+    row = (await db.execute(
+        select(*WORKLIST_COLUMNS, Task.status)
+        .join(ProcessInstance, Task.process_instance_id == ProcessInstance.id)
+        .where(Task.id == task_id)
+    )).one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    task = row._asdict()
+    task["next_actions"] = next_actions(row.process_definition_key, row.task_definition_key, row.variables)
+    return task
+
+@router.get("/tasks/{task_id}/detail", response_model=TaskDetailResponse)
+async def get_task(task_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await task_detail(db, task_id)
+
+@router.post("/tasks/claim", response_model=TaskDetailResponse, responses={204: {"description": "Queue is empty"}})
+async def claim_task(req: TaskClaimRequest, db: AsyncSession = Depends(get_async_db)):
+    """Assign the oldest unclaimed task of the caller's role to the caller."""
+    engine = AsyncProcessEngine(db)
+    try:
+        task_id = await engine.claim_task(req.user_id)
+    except UserNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ConcurrencyConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if task_id is None:
+        return Response(status_code=204)
+    return await task_detail(db, task_id)
+
+@router.get("/events/{user_id}")
+async def worklist_events(user_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Server-Sent Events: task_created / task_completed for the user's role and direct assignments."""
+    user = await user_directory.aget(db, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    sub = task_events.subscribe(user.role_name, user.id)
+
+    async def stream():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(sub.queue.get(), SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            task_events.unsubscribe(sub)
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(stream(), media_type="text/event-stream", headers=headers)
+
+@router.post("/tasks/complete-batch")
+async def complete_tasks_batch(req: TaskBatchCompleteRequest, db: AsyncSession = Depends(get_async_db)):
+    engine = AsyncProcessEngine(db)
+    try:
+        results = await engine.complete_tasks(req.user_id, [(item.task_id, item.data) for item in req.items])
+    except ConcurrencyConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    completed = sum(1 for r in results if r["status"] == "completed")
+    return {"completed": completed, "failed": len(results) - completed, "results": results}
+
+@router.post("/tasks/{task_id}/complete")
+async def complete_task(
+    task_id: int,
+    req: TaskCompleteRequest,
+    idempotency_key: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        return await idempotent(
+            db, "complete", idempotency_key, {"task_id": task_id, **req.model_dump()},
+            lambda engine: engine.complete_task(task_id, req.user_id, req.data),
+            lambda instance: {"status": "completed"},
+        )
+    except TaskNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (TaskNotPending, ConcurrencyConflict) as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.get("/history/{process_id}", response_model=HistoryPageResponse)
+async def get_history(
+    process_id: int,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    # Hot tables first; instances moved by the archive job are read from archived_*
+    instances, logs_table = ProcessInstance.__table__, HistoryLog.__table__
+    instance = (await db.execute(
+        select(instances.c.variables, instances.c.status).where(instances.c.id == process_id))).first()
+    if instance is None:
+        instances, logs_table = archived_process_instances, archived_history_logs
+        instance = (await db.execute(
+            select(instances.c.variables, instances.c.status).where(instances.c.id == process_id))).first()
+    if instance is None:
+        raise HTTPException(status_code=404, detail="Process not found")
+
+    logs, next_cursor = await paginate(
+        db, select(logs_table.c.id, *(logs_table.c[field] for field in HISTORY_FIELDS))
+        .where(logs_table.c.process_instance_id == process_id),
+        [logs_table.c.id], cursor, limit,  # id order is commit order (and exact, unlike timestamps)
+    )
+    snapshots = await variable_snapshots(db, process_id, [log.id for log in logs], logs_table)
+
+    return json_response({
+        "logs": [dict(zip(HISTORY_FIELDS, log[1:]), variables_snapshot=snapshots.get(log.id)) for log in logs],
+        "final_variables": instance.variables,
+        "status": instance.status,
+        "next_cursor": next_cursor,
+    })
+
+INSTANCE_COLUMNS = ["id", "process_definition_key", "status", "requester_id", "created_at"]
+
+def instances_query(status=None, process_key=None, created_from=None, created_to=None, include_variables=False,
+                    table=ProcessInstance.__table__):
+    # Column projection: the (potentially large) variables JSON only when asked for
+    columns = INSTANCE_COLUMNS + (["variables"] if include_variables else [])
+    stmt = select(*(table.c[name] for name in columns))
+    if status:
+        stmt = stmt.where(table.c.status.in_(status))
+    if process_key:
+        stmt = stmt.where(table.c.process_definition_key == process_key)
+    if created_from:
+        stmt = stmt.where(table.c.created_at >= created_from)
+    if created_to:
+        stmt = stmt.where(table.c.created_at < created_to)
+    return stmt
+
+def all_instances_query(*filters, **options):
+    """instances_query over the hot and the archived instances; page it by the returned id column."""
+    both = union_all(
+        instances_query(*filters, **options),
+        instances_query(*filters, **options, table=archived_process_instances),
+    ).subquery("instances")
+    return select(both), both.c.id
+
+def parse_variable_filters(filters):
+    # ["is_academic:true", "rkr_decision:Accepted"] -> {"is_academic": True, "rkr_decision": "Accepted"}
+    variables = {}
+    for item in filters or []:
+        name, sep, raw = item.partition(":")
+        if not sep or not name:
+            raise ValueError(f"Invalid variable filter {item!r}, expected name:value")
+        try:
+            variables[name] = json.loads(raw)
+        except ValueError:
+            variables[name] = raw
+    return variables
+
+def variable_conditions(dialect_name, variables):
+    if not variables:
+        return []
+    if dialect_name == "postgresql":
+        # One containment test for all filters, served by the jsonb_path_ops GIN index
+        return [type_coerce(ProcessInstance.variables, JSONB).contains(variables)]
+    conditions = []
+    for name, value in variables.items():
+        extracted = func.json_extract(ProcessInstance.variables, f'$."{name}"')
+        if value is None:
+            conditions.append(extracted.is_(None))
+        elif isinstance(value, (dict, list)):
+            conditions.append(extracted == json.dumps(value, separators=(",", ":")))
+        else:
+            conditions.append(extracted == value)
+    return conditions
+
+def json_default(value):
+    return value.isoformat() if isinstance(value, (datetime.date, datetime.datetime)) else str(value)
+
+async def stream_ndjson(stmt):
+    # Own session: yield-dependencies are closed before a StreamingResponse body is sent
+    async with ReadSessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+        async for rows in result.partitions():
+            yield b"".join(orjson.dumps(row, default=json_default) + b"\n" for row in row_dicts(rows))
+
+@router.get("/instances/search")
+async def search_instances(
+    response: Response,
+    var: Optional[List[str]] = Query(None, description="name:value, value parsed as JSON when possible; repeat to AND"),
+    status: Optional[List[str]] = Query(None),
+    process_key: Optional[str] = None,
+    include_variables: bool = False,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    try:
+        variables = parse_variable_filters(var)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    stmt = instances_query(status, process_key, include_variables=include_variables)
+    stmt = stmt.where(*variable_conditions(db.get_bind().dialect.name, variables))
+    rows, _ = await paginate(db, stmt, [ProcessInstance.id], cursor, limit, response)
+    return [row._asdict() for row in rows]
+
+@router.get("/instances")
+async def list_instances(
+    response: Response,
+    status: Optional[List[str]] = Query(None),
+    process_key: Optional[str] = None,
+    created_from: Optional[datetime.datetime] = None,
+    created_to: Optional[datetime.datetime] = None,
+    include_variables: bool = False,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    # Each branch of the UNION ALL is read in id order from its own (status, id) index
+    stmt, id_column = all_instances_query(status, process_key, created_from, created_to, include_variables)
+    if format == "ndjson":
+        # Server-side cursor, fetched in partitions: memory stays flat for any archive size
+        try:
+            stmt = keyset_select(stmt, [id_column], cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return StreamingResponse(stream_ndjson(stmt), media_type="application/x-ndjson")
+
+    rows, _ = await paginate(db, stmt, [id_column], cursor, limit, response)
+    return [row._asdict() for row in rows]
@@ -0,0 +1,102 @@
+"""Moves finished process instances, with their tasks and history, to the archived_* tables.
+
+Runs in the backend (ARCHIVE_INTERVAL_SECONDS) or once from the command line:
+    python -m app.services.archive
+"""
+import datetime
+import os
+
+from sqlalchemy import delete, func, insert, select
+
+from app.db.models import (
+    HistoryLog, ProcessInstance, Task,
+    archived_history_logs, archived_process_instances, archived_tasks, db_now,
+)
+from app.db.session import AsyncSessionLocal
+from app.services.jobs import PeriodicJob
+from app.services.metrics import Counters
+
+AFTER_DAYS = float(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "1000"))  # instances per transaction
+INTERVAL_SECONDS = float(os.getenv("ARCHIVE_INTERVAL_SECONDS", "3600"))  # 0 = no archival job in this process
+
+FINISHED = ("COMPLETED", "REJECTED")
+
+# hot table -> archive table, in delete order (history references tasks, tasks reference instances)
+ARCHIVES = (
+    (HistoryLog.__table__, archived_history_logs, "process_instance_id"),
+    (Task.__table__, archived_tasks, "process_instance_id"),
+    (ProcessInstance.__table__, archived_process_instances, "id"),
+)
+
+
+def archive_batch(db, cutoff, limit=BATCH_SIZE) -> int:
+    """Archive up to `limit` instances finished before `cutoff` in one transaction; returns how many."""
+    # Instances finished before ended_at existed count from their creation
+    due = select(ProcessInstance.id).where(
+        ProcessInstance.status.in_(FINISHED),
+        func.coalesce(ProcessInstance.ended_at, ProcessInstance.created_at) < cutoff,
+    ).order_by(ProcessInstance.id).limit(limit)
+    if db.get_bind().dialect.name == "postgresql":
+        due = due.with_for_update(skip_locked=True)  # replicas take different batches
+    ids = db.execute(due).scalars().all()
+    if not ids:
+        return 0
+    for hot, cold, column in ARCHIVES:
+        # INSERT ... SELECT: the rows never leave the database
+        db.execute(insert(cold).from_select([c.name for c in hot.columns],
+                                            select(*hot.columns).where(hot.c[column].in_(ids))))
+    for hot, _, column in ARCHIVES:
+        db.execute(delete(hot).where(hot.c[column].in_(ids)))
+    db.commit()
+    return len(ids)
+
+
+def cutoff_now(db):
+    # On the database clock, like ended_at and created_at
+    return db.scalar(select(db_now())) - datetime.timedelta(days=AFTER_DAYS)
+
+
+class ArchiveJob(PeriodicJob):
+    """Periodically archives every instance finished more than AFTER_DAYS days ago, BATCH_SIZE per transaction."""
+
+    name = "Archive job"
+
+    def __init__(self, interval=INTERVAL_SECONDS):
+        super().__init__(interval)
+        self.counters = Counters("runs", "archived")
+        self.last_run_at = None
+
+    async def run_once(self) -> int:
+        async with AsyncSessionLocal() as db:
+            cutoff = await db.run_sync(cutoff_now)
+        total = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                count = await db.run_sync(lambda s: archive_batch(s, cutoff))
+            total += count
+            self.counters.inc("archived", count)
+            if count < BATCH_SIZE:
+                break
+        self.counters.inc("runs")
+        self.last_run_at = datetime.datetime.utcnow().isoformat(timespec="seconds")
+        return total
+
+    def snapshot(self) -> dict:
+        return {"running": self.running, "after_days": AFTER_DAYS, "last_run_at": self.last_run_at,
+                **self.counters.snapshot()}
+
+
+archive_job = ArchiveJob()
+
+
+if __name__ == "__main__":
+    from app.db.session import SessionLocal
+
+    total = 0
+    with SessionLocal() as db:
+        cutoff = cutoff_now(db)
+        while count := archive_batch(db, cutoff):
+            total += count
+            print(f"Archived {total} instances")
+    print(f"Done: {total} instances finished before {cutoff:%Y-%m-%d} archived")
@@ -0,0 +1,222 @@
+import os
+import xml.etree.ElementTree as ET
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, NamedTuple, Optional, Union
+
+BPMN_NS = {"bpmn": "http://www.omg.org/spec/BPMN/20100524/MODEL"}
+
+# The .bpmn files live next to the backend (Mipb/); in Docker they are mounted into BPMN_DIR.
+BPMN_DIR = Path(os.getenv("BPMN_DIR", Path(__file__).resolve().parents[3]))
+
+# process_definition_key -> BPMN file
+PROCESS_FILES = {
+    "leave_request": "Leave Request.bpmn",
+    "change_employment": "Change of Employment Conditions.bpmn",
+    "decorations": "Decorations and Medals.bpmn",
+}
+
+# Lane names that differ from the seeded User.role_name values (see init_db.py)
+LANE_ROLES = {
+    "Personnel Department (PD)": "PD (Personnel Department)",
+    "PRK / Chancellor": "Vice-Rector for Education (PRK)",
+    "Military Personnel Department (MPD)": "MPD (Military Personnel Dept.)",
+}
+
+# The diagrams carry no condition expressions, only "Yes"/"No" flow labels.
+# (process key, gateway id) -> (variable, default, expected value; None = truthy)
+GATEWAY_CONDITIONS = {
+    ("leave_request", "Gateway_IsAcademicTeacher"): ("is_academic", False, None),
+    ("change_employment", "Gateway_IsAcademicTeacher"): ("is_academic", True, None),
+    ("decorations", "Gateway_RKRDecision"): ("rkr_decision", "Rejected", "Accepted"),
+}
+
+# Tasks already covered by the start form, so the process starts right after them
+START_FORM_TASKS = {
+    "decorations": {"Task_SubmitApplication"},
+}
+
+# System steps modelled as user tasks: run by the service-task workers, bound to a handler
+# registered in app/services/service_tasks.py. <bpmn:serviceTask> nodes are automatic too.
+SERVICE_TASKS = {
+    ("leave_request", "Task_InformHeadOU"): "notify_head_ou",
+    ("decorations", "Task_HandleApplicationsExternal"): "transfer_to_external",
+}
+
+# SLA: hours a human task may stay pending before the escalation scheduler picks it up.
+# Unlisted tasks get DEFAULT_DUE_HOURS, set by the DEFAULT_TASK_DUE_HOURS env var (0 = no deadline).
+DEFAULT_DUE_HOURS = float(os.getenv("DEFAULT_TASK_DUE_HOURS", "120"))
+TASK_DUE_HOURS = {
+    # Leave has to be decided before it starts
+    ("leave_request", "Task_ReviewAndForward_HeadOU"): 48,
+    ("leave_request", "Task_ReviewApplication_PD"): 48,
+    ("leave_request", "Task_MakeDecision_RKR"): 72,
+    ("leave_request", "Task_MakeDecision_Chancellor"): 72,
+    ("decorations", "Task_MakeDecision"): 240,
+}
+
+TASK_TAGS = ("userTask", "task", "manualTask", "serviceTask")
+
+
+class TaskStep(NamedTuple):
+    key: str
+    name: str
+    role: Optional[str]
+    handler: Optional[str] = None  # automatic step: no role queue, run by a service-task worker
+    due_hours: Optional[float] = None  # SLA, see TASK_DUE_HOURS
+
+
+class EndStep(NamedTuple):
+    key: str
+    status: str  # COMPLETED, REJECTED
+
+
+class Branch(NamedTuple):
+    gateway: str
+    variable: str
+    default: Any
+    expected: Any
+    yes: "Transition"
+    no: "Transition"
+
+    def choose(self, variables: dict) -> "Transition":
+        value = (variables or {}).get(self.variable, self.default)
+        taken = bool(value) if self.expected is None else value == self.expected
+        return self.yes if taken else self.no
+
+
+Transition = Union[TaskStep, EndStep, Branch]
+
+
+class ProcessModels:
+    """Compiled BPMN definitions: read-only lookup tables keyed by process key and task key."""
+
+    def __init__(self, starts: dict, transitions: dict, tasks: dict):
+        self.starts = MappingProxyType(starts)
+        self.transitions = MappingProxyType(transitions)
+        self.tasks = MappingProxyType(tasks)
+
+    def start(self, process_key: str) -> Optional[Transition]:
+        return self.starts.get(process_key)
+
+    def next(self, process_key: str, task_key: str) -> Optional[Transition]:
+        return self.transitions.get((process_key, task_key))
+
+    def task(self, process_key: str, task_key: str) -> Optional[TaskStep]:
+        return self.tasks.get((process_key, task_key))
+
+
+def resolve(transition: Optional[Transition], variables: dict) -> Optional[Union[TaskStep, EndStep]]:
+    # Walk gateway branches until a concrete task or end event is reached
+    while isinstance(transition, Branch):
+        transition = transition.choose(variables)
+    return transition
+
+
+def outcomes(transition: Optional[Transition], decisions: tuple = ()):
+    """Yield (decisions, step) for every task or end event a transition can lead to.
+
+    `decisions` are the (Branch, took_yes) pairs on the way there.
+    """
+    if isinstance(transition, Branch):
+        yield from outcomes(transition.yes, decisions + ((transition, True),))
+        yield from outcomes(transition.no, decisions + ((transition, False),))
+    elif transition is not None:
+        yield decisions, transition
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def compile_bpmn(process_key: str, path: Path):
+    root = ET.parse(path).getroot()
+    process = root.find("bpmn:process", BPMN_NS)
+    if process is None:
+        raise ValueError(f"No <bpmn:process> in {path}")
+
+    lane_of = {}
+    for lane in process.iter(f"{{{BPMN_NS['bpmn']}}}lane"):
+        role = LANE_ROLES.get(lane.get("name"), lane.get("name"))
+        for ref in lane.findall("bpmn:flowNodeRef", BPMN_NS):
+            lane_of[ref.text.strip()] = role
+
+    nodes = {}
+    outgoing = {}
+    for el in process:
+        kind = _local(el.tag)
+        if kind == "sequenceFlow":
+            outgoing.setdefault(el.get("sourceRef"), []).append((el.get("name") or "", el.get("targetRef")))
+        elif el.get("id"):
+            nodes[el.get("id")] = (kind, el)
+
+    def follow(node_id: str, seen: frozenset = frozenset()) -> Transition:
+        if node_id in seen:
+            raise ValueError(f"{path.name}: cycle through gateway {node_id}")
+        kind, el = nodes[node_id]
+        if kind in TASK_TAGS:
+            handler = SERVICE_TASKS.get((process_key, node_id))
+            if handler is None and kind == "serviceTask":
+                handler = node_id  # bind by node id unless configured above
+            if handler:
+                return TaskStep(node_id, el.get("name"), None, handler)
+            due_hours = TASK_DUE_HOURS.get((process_key, node_id), DEFAULT_DUE_HOURS) or None
+            return TaskStep(node_id, el.get("name"), lane_of.get(node_id), None, due_hours)
+        if kind == "endEvent":
+            status = "REJECTED" if "reject" in node_id.lower() else "COMPLETED"
+            return EndStep(node_id, status)
+        if kind == "exclusiveGateway":
+            flows = outgoing.get(node_id, [])
+            if len(flows) == 1:  # join gateway
+                return follow(flows[0][1], seen | {node_id})
+            condition = GATEWAY_CONDITIONS.get((process_key, node_id))
+            if condition is None:
+                raise ValueError(f"{path.name}: no condition configured for gateway {node_id}")
+            yes = [t for n, t in flows if n.lower().startswith("yes")]
+            no = [t for n, t in flows if n.lower().startswith("no")]
+            if len(yes) != 1 or len(no) != 1:
+                raise ValueError(f"{path.name}: gateway {node_id} needs one 'Yes' and one 'No' flow")
+            variable, default, expected = condition
+            return Branch(node_id, variable, default, expected,
+                          follow(yes[0], seen | {node_id}), follow(no[0], seen | {node_id}))
+        raise ValueError(f"{path.name}: unsupported BPMN element {kind} ({node_id})")
+
+    def after(node_id: str) -> Optional[Transition]:
+        flows = outgoing.get(node_id, [])
+        if not flows:
+            return None
+        if len(flows) > 1:
+            raise ValueError(f"{path.name}: {node_id} has more than one outgoing flow")
+        return follow(flows[0][1])
+
+    tasks = {}
+    transitions = {}
+    start = None
+    for node_id, (kind, el) in nodes.items():
+        if kind in TASK_TAGS:
+            tasks[(process_key, node_id)] = follow(node_id)
+            transitions[(process_key, node_id)] = after(node_id)
+        elif kind == "startEvent":
+            start = after(node_id)
+
+    skipped = START_FORM_TASKS.get(process_key, set())
+    while isinstance(start, TaskStep) and start.key in skipped:
+        start = transitions[(process_key, start.key)]
+
+    return start, transitions, tasks
+
+
+def load_process_models(bpmn_dir: Path = BPMN_DIR, files: dict = PROCESS_FILES) -> ProcessModels:
+    starts, transitions, tasks = {}, {}, {}
+    for process_key, filename in files.items():
+        start, process_transitions, process_tasks = compile_bpmn(process_key, Path(bpmn_dir) / filename)
+        starts[process_key] = start
+        transitions.update(process_transitions)
+        tasks.update(process_tasks)
+    return ProcessModels(starts, transitions, tasks)
+
+
+@lru_cache(maxsize=None)
+def get_process_models() -> ProcessModels:
+    return load_process_models()
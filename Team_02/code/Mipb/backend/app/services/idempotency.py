@@ -0,0 +1,135 @@
+import datetime
+import hashlib
+import json
+import os
+
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+
+from app.db.models import IdempotencyKey
+from app.db.session import AsyncSessionLocal
+from app.services.jobs import PeriodicJob
+from app.services.metrics import Counters
+from app.services.process_engine import AsyncProcessEngine, TaskNotPending
+
+HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+# Retries are expected within minutes; the row is kept long enough for a client to give up
+TTL_HOURS = float(os.getenv("IDEMPOTENCY_TTL_HOURS", "24"))
+PURGE_INTERVAL_SECONDS = float(os.getenv("IDEMPOTENCY_PURGE_INTERVAL_SECONDS", "3600"))  # 0 = no purge job here
+PURGE_BATCH_SIZE = 10000
+
+
+class KeyReused(Exception):
+    """The Idempotency-Key was already used for a different request."""
+
+
+def fingerprint(*parts) -> str:
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class IdempotencyRecord:
+    """The stored response of one request, added by ProcessEngine.commit to the operation's own transaction.
+
+    So the key exists exactly when the operation committed: a retry either
+    finds the response or runs the operation, never both.
+    """
+
+    def __init__(self, scope, key, request_fingerprint, respond, status_code=200):
+        self.scope = scope
+        self.key = key
+        self.fingerprint = request_fingerprint
+        self.respond = respond  # engine outcome (e.g. the ProcessInstance) -> response body
+        self.status_code = status_code
+
+    def stage(self, db, outcome):
+        now = datetime.datetime.utcnow()
+        db.add(IdempotencyKey(
+            scope=self.scope, key=self.key, fingerprint=self.fingerprint,
+            status_code=self.status_code, response=self.respond(outcome),
+            created_at=now, expires_at=now + datetime.timedelta(hours=TTL_HOURS),
+        ))
+
+
+async def lookup(db, scope, key):
+    stored = (await db.execute(
+        select(IdempotencyKey).where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+    )).scalar_one_or_none()
+    if stored is not None and stored.expires_at <= datetime.datetime.utcnow():
+        # Expired: free the key for this request (purge_expired removes the rest)
+        await db.delete(stored)
+        await db.commit()
+        return None
+    return stored
+
+
+def replay(stored, request_fingerprint):
+    if stored.fingerprint != request_fingerprint:
+        raise KeyReused(f"{HEADER} was already used for a different request")
+    return JSONResponse(stored.response, status_code=stored.status_code, headers={REPLAYED_HEADER: "true"})
+
+
+async def run_idempotent(db, scope, key, request_fingerprint, operation, respond):
+    """Run `operation(AsyncProcessEngine)` at most once per (scope, key); returns the response body.
+
+    Without a key the operation just runs. A retry with a known key gets the
+    stored response back (with the Idempotent-Replayed header), also when it
+    arrives while the first request is still running and waits for it.
+    """
+    if key is None:
+        return respond(await operation(AsyncProcessEngine(db)))
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise ValueError(f"{HEADER} must be 1-{MAX_KEY_LENGTH} characters")
+    stored = await lookup(db, scope, key)
+    if stored is not None:
+        return replay(stored, request_fingerprint)
+    try:
+        outcome = await operation(AsyncProcessEngine(db, IdempotencyRecord(scope, key, request_fingerprint, respond)))
+    except (IntegrityError, TaskNotPending):
+        # A concurrent request with the same key committed first: either our key insert failed (the
+        # whole transaction was rolled back), or complete_task waited on the task lock and found it done
+        stored = await lookup(db, scope, key)
+        if stored is None:
+            raise
+        return replay(stored, request_fingerprint)
+    return respond(outcome)
+
+
+def purge_expired(db, limit=PURGE_BATCH_SIZE) -> int:
+    """Delete up to `limit` expired keys (sync session); returns how many."""
+    expired = select(IdempotencyKey.id).where(
+        IdempotencyKey.expires_at <= datetime.datetime.utcnow()
+    ).order_by(IdempotencyKey.expires_at).limit(limit)
+    ids = db.execute(expired).scalars().all()
+    if ids:
+        db.execute(delete(IdempotencyKey).where(IdempotencyKey.id.in_(ids)))
+        db.commit()
+    return len(ids)
+
+
+class ExpiredKeyPurge(PeriodicJob):
+    """Periodically deletes stored responses past their TTL, PURGE_BATCH_SIZE keys per transaction."""
+
+    name = "Idempotency key purge"
+
+    def __init__(self, interval=PURGE_INTERVAL_SECONDS):
+        super().__init__(interval)
+        self.counters = Counters("runs", "purged")
+        self.last_run_at = None
+
+    async def run_once(self) -> bool:
+        async with AsyncSessionLocal() as db:
+            count = await db.run_sync(purge_expired)
+        self.counters.inc("runs")
+        self.counters.inc("purged", count)
+        self.last_run_at = datetime.datetime.utcnow().isoformat(timespec="seconds")
+        return count == PURGE_BATCH_SIZE  # a full batch: more may be left, go on without sleeping
+
+    def snapshot(self) -> dict:
+        return {"running": self.running, "ttl_hours": TTL_HOURS, "last_run_at": self.last_run_at,
+                **self.counters.snapshot()}
+
+
+expired_key_purge = ExpiredKeyPurge()
@@ -0,0 +1,46 @@
+import asyncio
+
+
+class PeriodicJob:
+    """Background asyncio loop(s) calling run_once() every `interval` seconds.
+
+    Subclasses implement run_once(); when it returns True there may be more
+    work right away and the loop skips the sleep. An error is printed and the
+    loop carries on. `workers` loops run side by side; by default one, or none
+    when interval is 0 (the job is off in this process).
+    """
+
+    name = "Periodic job"
+
+    def __init__(self, interval, workers=None):
+        self.interval = interval
+        self.workers = (1 if interval > 0 else 0) if workers is None else workers
+        self.tasks = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self.tasks)
+
+    async def run_once(self):
+        raise NotImplementedError
+
+    async def loop(self):
+        while True:
+            try:
+                busy = await self.run_once() is True
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"{self.name} error: {e}")
+                busy = False
+            if not busy:
+                await asyncio.sleep(self.interval)
+
+    def start(self):
+        self.tasks = [asyncio.create_task(self.loop()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
@@ -0,0 +1,136 @@
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.db.models import ProcessKpi
+
+# task_definition_key of the whole-instance rows (start to end)
+INSTANCE = ""
+
+HOUR = 3600
+# (upper bound in seconds, ProcessKpi column); the last bucket is open-ended
+DURATION_BUCKETS = (
+    (HOUR, "under_1h"),
+    (4 * HOUR, "under_4h"),
+    (8 * HOUR, "under_8h"),
+    (24 * HOUR, "under_1d"),
+    (72 * HOUR, "under_3d"),
+    (168 * HOUR, "under_1w"),
+    (336 * HOUR, "under_2w"),
+    (720 * HOUR, "under_30d"),
+    (None, "over_30d"),
+)
+BUCKET_COLUMNS = tuple(column for _, column in DURATION_BUCKETS)
+KEY_COLUMNS = ("process_definition_key", "day", "task_definition_key", "assignee_role")
+
+
+def bucket_of(seconds):
+    for bound, column in DURATION_BUCKETS:
+        if bound is None or seconds < bound:
+            return column
+
+
+class KpiBatch:
+    """Completions of one transaction, summed per ProcessKpi row and upserted at commit.
+
+    The upsert adds to the stored row in the database (ON CONFLICT DO
+    UPDATE), so concurrent transactions never overwrite each other's counts.
+    """
+
+    def __init__(self):
+        self.rows = {}  # key columns -> increments
+
+    def add(self, process_key, task_key, role, started_at, ended_at):
+        if started_at is None:
+            return
+        seconds = (ended_at - started_at).total_seconds()
+        key = (process_key, ended_at.date(), task_key, role or "")
+        row = self.rows.get(key)
+        if row is None:
+            row = self.rows[key] = dict(zip(KEY_COLUMNS, key), count=0, duration_sum=0.0,
+                                        duration_min=seconds, duration_max=seconds,
+                                        **dict.fromkeys(BUCKET_COLUMNS, 0))
+        row["count"] += 1
+        row["duration_sum"] += seconds
+        row["duration_min"] = min(row["duration_min"], seconds)
+        row["duration_max"] = max(row["duration_max"], seconds)
+        row[bucket_of(seconds)] += 1
+
+    def flush(self, db):
+        if not self.rows:
+            return
+        postgres = db.get_bind().dialect.name == "postgresql"
+        stmt = (pg_insert if postgres else sqlite_insert)(ProcessKpi)
+        least, greatest = (func.least, func.greatest) if postgres else (func.min, func.max)  # scalar min/max in SQLite
+        table = ProcessKpi.__table__.c
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(KEY_COLUMNS),
+            set_={
+                **{c: table[c] + stmt.excluded[c] for c in ("count", "duration_sum", *BUCKET_COLUMNS)},
+                "duration_min": least(table.duration_min, stmt.excluded.duration_min),
+                "duration_max": greatest(table.duration_max, stmt.excluded.duration_max),
+            },
+        )
+        # Sorted: concurrent transactions lock the rows in the same order (no deadlocks)
+        db.execute(stmt, [self.rows[key] for key in sorted(self.rows)])
+        self.rows = {}
+
+
+def percentile(buckets: dict, count: int, p: float):
+    """Upper bound (seconds) of the bucket holding the p-th percentile; None if above the last bound."""
+    if not count:
+        return None
+    running = 0
+    for bound, column in DURATION_BUCKETS:
+        running += buckets[column]
+        if running >= count * p / 100:
+            return bound
+    return None
+
+
+async def kpi_summary(db, group_by, process_key=None, date_from=None, date_to=None, instances=False):
+    """Sums the pre-aggregated rows over the day range, grouped by `group_by` ProcessKpi columns.
+
+    Task rows by default; `instances=True` reads the whole-instance rows instead.
+    """
+    groups = [getattr(ProcessKpi, column) for column in group_by]
+    stmt = select(
+        *groups,
+        func.sum(ProcessKpi.count).label("count"),
+        func.sum(ProcessKpi.duration_sum).label("duration_sum"),
+        func.min(ProcessKpi.duration_min).label("duration_min"),
+        func.max(ProcessKpi.duration_max).label("duration_max"),
+        *(func.sum(getattr(ProcessKpi, c)).label(c) for c in BUCKET_COLUMNS),
+    ).group_by(*groups).order_by(*groups)
+    if instances:
+        stmt = stmt.where(ProcessKpi.task_definition_key == INSTANCE)
+    else:
+        stmt = stmt.where(ProcessKpi.task_definition_key != INSTANCE)
+    if process_key:
+        stmt = stmt.where(ProcessKpi.process_definition_key == process_key)
+    if date_from:
+        stmt = stmt.where(ProcessKpi.day >= date_from)
+    if date_to:
+        stmt = stmt.where(ProcessKpi.day <= date_to)
+
+    results = []
+    for row in (await db.execute(stmt)).mappings():
+        count = row["count"]
+        buckets = {c: row[c] for c in BUCKET_COLUMNS}
+        results.append({
+            **{column: row[column] for column in group_by},
+            "count": count,
+            "avg_hours": round(row["duration_sum"] / count / HOUR, 2) if count else None,
+            "min_hours": round(row["duration_min"] / HOUR, 2) if row["duration_min"] is not None else None,
+            "max_hours": round(row["duration_max"] / HOUR, 2) if row["duration_max"] is not None else None,
+            # Estimates from the sketch: "at most N hours"
+            "p50_hours_at_most": hours(percentile(buckets, count, 50)),
+            "p90_hours_at_most": hours(percentile(buckets, count, 90)),
+            "buckets": buckets,
+        })
+    return results
+
+
+def hours(seconds):
+    return seconds / HOUR if seconds is not None else None
+
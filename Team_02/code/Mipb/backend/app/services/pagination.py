@@ -0,0 +1,72 @@
+import base64
+import datetime
+import json
+
+from sqlalchemy import DateTime, tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(values):
+    # Opaque to clients: base64url(JSON) of the last row's sort key
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime.datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def cursor_value(col, value):
+    # A tampered or stale cursor must not reach the comparison (TypeError) or the database (DataError)
+    if isinstance(col.type, DateTime):
+        if not isinstance(value, str):
+            raise TypeError
+        return datetime.datetime.fromisoformat(value)
+    expected = col.type.python_type
+    if isinstance(value, bool) or not isinstance(value, expected):
+        raise TypeError
+    return value
+
+
+def decode_cursor(cursor, order_by):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(order_by):
+            raise ValueError
+        return [cursor_value(col, v) for col, v in zip(order_by, values)]
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def keyset_select(stmt, order_by, cursor=None, limit=None):
+    """Restrict a select() to the page after `cursor` in `order_by` order.
+
+    `order_by` must be a unique, ascending key backed by an index so that every
+    page costs O(limit) no matter how deep it is. One extra row is fetched to
+    tell whether another page follows (see split_page).
+    """
+    if cursor:
+        stmt = stmt.where(tuple_(*order_by) > tuple_(*decode_cursor(cursor, order_by)))
+    stmt = stmt.order_by(*order_by)
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    return stmt
+
+
+def split_page(rows, order_by, limit=None):
+    """Return (rows, next_cursor) for rows fetched with keyset_select."""
+    if limit is None or len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor([getattr(rows[-1], col.key) for col in order_by])
+
+
+def page_items(items, order_by, cursor=None, limit=None):
+    """keyset_select + split_page for an in-memory list of dicts already sorted by `order_by`."""
+    keys = [col.key for col in order_by]
+    if cursor:
+        after = decode_cursor(cursor, order_by)
+        items = [item for item in items if [item[k] for k in keys] > after]
+    if limit is None or len(items) <= limit:
+        return list(items), None
+    items = items[:limit]
+    return items, encode_cursor([items[-1][k] for k in keys])
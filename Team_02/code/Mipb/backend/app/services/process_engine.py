@@ -1,193 +1,464 @@
-
-from sqlalchemy.orm import Session
-from app.db.models import ProcessInstance, Task, HistoryLog, User
-import datetime
-
-class ProcessEngine:
-    def __init__(self, db: Session):
-        self.db = db
-
-    def start_process(self, process_key: str, user_id: int, initial_data: dict):
-        # Create Instance
-        instance = ProcessInstance(
-            process_definition_key=process_key,
-            requester_id=user_id,
-            variables=initial_data,
-            status="ACTIVE"
-        )
-        self.db.add(instance)
-        self.db.flush() # get ID
-
-        # Log History
-        self.log_history(instance.id, None, user_id, "START_PROCESS", "Process started")
-
-        # Determine First Task
-        if process_key == "leave_request":
-             # Start -> Head of O.U.
-             self.create_task(instance.id, "Task_ReviewAndForward_HeadOU", "Review and approve leave request", role="Head of O.U.")
-        
-        elif process_key == "change_employment":
-            # Start -> Head of O.U.
-            self.create_task(instance.id, "Task_ReviewAndForward_HeadOU", "Review and forward application to PD", role="Head of O.U.")
-            
-        elif process_key == "decorations":
-            # Start -> Submit (Head OU) - Automatic submission via Start Form
-            # We skip creating "Task_SubmitApplication" because the user just filled it in StartProcess.
-            # Directly move to the next step: Present for Acceptance (PD)
-            self.create_task(instance.id, "Task_PresentApplicationsForAcceptance", "Present applications for acceptance (PRK/Chancellor)", role="PD (Personnel Department)")
-
-        self.db.commit()
-        return instance
-
-    def complete_task(self, task_id: int, user_id: int, data: dict):
-        task = self.db.query(Task).get(task_id)
-        if not task:
-            raise Exception("Task not found")
-        
-        instance = self.db.query(ProcessInstance).get(task.process_instance_id)
-        
-        # Update Variables
-        current_vars = dict(instance.variables) if instance.variables else {}
-        current_vars.update(data)
-        instance.variables = current_vars
-        
-        # Log History
-        self.log_history(instance.id, task.id, user_id, "COMPLETE_TASK", f"Completed {task.name}", str(data))
-        
-        # Mark Task Completed
-        task.status = "COMPLETED"
-        
-        # Calculate Next Step
-        self.route_process(instance, task.task_definition_key)
-        
-        self.db.commit()
-        return instance
-
-    def create_task(self, instance_id, task_key, name, role=None, user_id=None):
-        new_task = Task(
-            process_instance_id=instance_id,
-            task_definition_key=task_key,
-            name=name,
-            assignee_role=role,
-            assignee_user_id=user_id,
-            status="PENDING"
-        )
-        self.db.add(new_task)
-        return new_task
-
-    def log_history(self, instance_id, task_id, user_id, action, comment, details=None):
-        # Fetch user name for snapshot
-        user_name = "System"
-        if user_id:
-            u = self.db.query(User).get(user_id)
-            if u: user_name = u.full_name
-
-        log = HistoryLog(
-            process_instance_id=instance_id,
-            task_id=task_id,
-            user_id=user_id,
-            user_name=user_name,
-            action=action,
-            comment=f"{comment} {details if details else ''}"
-        )
-        self.db.add(log)
-
-    def route_process(self, instance, completed_task_key):
-        vars = instance.variables
-        
-        # --- Leave Request Logic ---
-        if instance.process_definition_key == "leave_request":
-            if completed_task_key == "Task_ReviewAndForward_HeadOU":
-                self.create_task(instance.id, "Task_ReviewApplication_PD", "Review leave request (check entitlement)", role="PD (Personnel Department)")
-            
-            elif completed_task_key == "Task_ReviewApplication_PD":
-                # Gateway: IsAcademicTeacher
-                is_academic = vars.get("is_academic", False) # Boolean from form
-                if is_academic:
-                    self.create_task(instance.id, "Task_Review_PRK", "Review application (PRK) and forward to PRN", role="Vice-Rector for Education (PRK)")
-                else:
-                    self.create_task(instance.id, "Task_MakeDecision_Chancellor", "Make decision (KAN) and return to PD", role="Chancellor (KAN)")
-            
-            elif completed_task_key == "Task_Review_PRK":
-                self.create_task(instance.id, "Task_Review_PRN", "Review application (PRN) and forward to Rector", role="Vice-Rector for Scientific Affairs (PRN)")
-            
-            elif completed_task_key == "Task_Review_PRN":
-                self.create_task(instance.id, "Task_MakeDecision_RKR", "Make decision (RKR) and return to PD", role="Rector (RKR)")
-            
-            elif completed_task_key in ["Task_MakeDecision_RKR", "Task_MakeDecision_Chancellor"]:
-                # Join Gateway -> Inform Head OU
-                self.create_task(instance.id, "Task_InformHeadOU", "Inform Head of O.U. about the decision", role="PD (Personnel Department)")
-            
-            elif completed_task_key == "Task_InformHeadOU":
-                self.create_task(instance.id, "Task_ImplementChanges", "Register leave in HR system", role="PD (Personnel Department)")
-            
-            elif completed_task_key == "Task_ImplementChanges":
-                self.end_process(instance, "COMPLETED")
-
-        # --- Change of Employment Logic ---
-        elif instance.process_definition_key == "change_employment":
-            if completed_task_key == "Task_ReviewAndForward_HeadOU":
-                self.create_task(instance.id, "Task_ReviewApplication_PD", "Review application (PD)", role="PD (Personnel Department)")
-            
-            elif completed_task_key == "Task_ReviewApplication_PD":
-                 self.create_task(instance.id, "Task_Review_KWE", "Review application (Quartermaster)", role="Quartermaster (KWE)")
-            
-            elif completed_task_key == "Task_Review_KWE":
-                is_academic = vars.get("is_academic", True) # Default true per doc?
-                if is_academic:
-                     self.create_task(instance.id, "Task_Review_PRK", "Review application (PRK) and forward to PRN", role="Vice-Rector for Education (PRK)")
-                else:
-                     self.create_task(instance.id, "Task_MakeDecision_Chancellor", "Make decision (KAN) and return to PD", role="Chancellor (KAN)")
-            
-            elif completed_task_key == "Task_Review_PRK":
-                self.create_task(instance.id, "Task_Review_PRN", "Review application (PRN) and forward to Rector", role="Vice-Rector for Scientific Affairs (PRN)")
-
-            elif completed_task_key == "Task_Review_PRN":
-                 self.create_task(instance.id, "Task_MakeDecision_RKR", "Make decision (RKR) and return to PD", role="Rector (RKR)")
-
-            elif completed_task_key in ["Task_MakeDecision_RKR", "Task_MakeDecision_Chancellor"]:
-                self.create_task(instance.id, "Task_ImplementAndPrepare", "Implement, Prepare, and Inform", role="PD (Personnel Department)")
-            
-            elif completed_task_key == "Task_ImplementAndPrepare":
-                self.create_task(instance.id, "Task_HandOverAndArchive", "Hand Over Documents and Archive", role="PD (Personnel Department)")
-            
-            elif completed_task_key == "Task_HandOverAndArchive":
-                self.end_process(instance, "COMPLETED")
-
-        # --- Decorations Logic ---
-        elif instance.process_definition_key == "decorations":
-            if completed_task_key == "Task_SubmitApplication":
-                 self.create_task(instance.id, "Task_PresentApplicationsForAcceptance", "Present applications for acceptance (PRK/Chancellor)", role="PD (Personnel Department)")
-            
-            elif completed_task_key == "Task_PresentApplicationsForAcceptance":
-                self.create_task(instance.id, "Task_ReviewApplications", "Review applications and forward to PD", role="Vice-Rector for Education (PRK)") # Or Chancellor? Scenario says PRK/Chancellor role. Used PRK user in scenario.
-            
-            elif completed_task_key == "Task_ReviewApplications":
-                self.create_task(instance.id, "Task_PresentApplicationsToRKR", "Present reviewed applications to Rector", role="PD (Personnel Department)")
-            
-            elif completed_task_key == "Task_PresentApplicationsToRKR":
-                self.create_task(instance.id, "Task_MakeDecision", "Make decision", role="Rector (RKR)")
-            
-            elif completed_task_key == "Task_MakeDecision":
-                decision = vars.get("rkr_decision", "Rejected")
-                if decision == "Accepted":
-                    self.create_task(instance.id, "Task_ForwardApplicationsToMPD", "Forward accepted applications to MPD", role="PD (Personnel Department)")
-                else:
-                    self.end_process(instance, "REJECTED")
-            
-            elif completed_task_key == "Task_ForwardApplicationsToMPD":
-                 self.create_task(instance.id, "Task_HandleApplicationsExternal", "Handle applications (external transfer)", role="MPD (Military Personnel Dept.)")
-            
-            elif completed_task_key == "Task_HandleApplicationsExternal":
-                 self.create_task(instance.id, "Task_ReceiveDecision", "Receive decision on award", role="PD (Personnel Department)")
-            
-            elif completed_task_key == "Task_ReceiveDecision":
-                 self.create_task(instance.id, "Task_EnterToRegister", "Enter decoration into register", role="PD (Personnel Department)")
-            
-            elif completed_task_key == "Task_EnterToRegister":
-                 self.end_process(instance, "COMPLETED")
-
-    def end_process(self, instance, status):
-        instance.status = status
-        self.log_history(instance.id, None, None, "END_PROCESS", f"Process ended with status {status}")
-
+
+from sqlalchemy import select, insert, update, or_, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models import ProcessInstance, Task, HistoryLog, db_now
+from app.services.bpmn_loader import get_process_models, resolve, TaskStep, EndStep
+from app.services.user_directory import user_directory
+from app.services.task_events import task_events, task_event
+from app.services.variable_history import changed_keys, next_checkpoint
+from app.services.kpi import KpiBatch, INSTANCE
+from app.services import profiling
+import asyncio
+import datetime
+import os
+import random
+from typing import NamedTuple
+
+RETRY_ATTEMPTS = int(os.getenv("PROCESS_RETRY_ATTEMPTS", "5"))
+RETRY_BASE_DELAY = float(os.getenv("PROCESS_RETRY_BASE_DELAY", "0.02"))
+
+# PostgreSQL serialization_failure / deadlock_detected
+RETRYABLE_SQLSTATES = {"40001", "40P01"}
+
+# Unclaimed tasks tried per round by the compare-and-set claim (non-Postgres)
+CLAIM_CANDIDATES = 10
+
+class ServiceCall(NamedTuple):
+    """A leased service task: run `handler`, then finish or fail it quoting `attempt`."""
+    task_id: int
+    process_key: str
+    task_key: str
+    handler: str
+    attempt: int
+    variables: dict
+
+class TaskNotFound(LookupError):
+    pass
+
+class TaskNotPending(Exception):
+    pass
+
+class UserNotFound(LookupError):
+    pass
+
+class ConcurrencyConflict(Exception):
+    """Another transaction changed the same instance first; safe to retry."""
+
+class ProcessEngine:
+    def __init__(self, db: Session, idempotency=None):
+        self.db = db
+        self.idempotency = idempotency  # IdempotencyRecord committed with the operation (app/services/idempotency.py)
+        self.models = get_process_models()
+        self.history_buffer = None  # set by complete_tasks to batch HistoryLog inserts
+        self.task_changes = []  # (event type, Task, extra fields) published once the transaction commits
+        self.jsonb = db.get_bind().dialect.name == "postgresql"
+        self.variables = {}  # instance id -> merged variables, for routing before the UPDATE runs
+        self.variable_deltas = {}  # instance id -> keys changed in this transaction
+        self.kpis = KpiBatch()  # cycle times of the tasks/instances finished in this transaction
+        self.db_time = None  # database clock, read once per transaction (see now())
+
+    @profiling.operation("start_process")
+    def start_process(self, process_key: str, user_id: int, initial_data: dict):
+        # Create Instance
+        instance = ProcessInstance(
+            process_definition_key=process_key,
+            requester_id=user_id,
+            variables=initial_data,
+            status="ACTIVE"
+        )
+        self.db.add(instance)
+        self.db.flush() # get ID
+        profiling.label(process_key, instance.id)
+
+        # Log History
+        self.log_history(instance.id, None, user_id, "START_PROCESS", "Process started", checkpoint=initial_data or {})
+
+        # Determine First Task
+        self.follow_transition(instance, self.models.start(process_key))
+
+        self.commit(outcome=instance)
+        return instance
+
+    @profiling.operation("complete_task")
+    def complete_task(self, task_id: int, user_id: int, data: dict):
+        # Lock the task row so a concurrent completion waits and then sees COMPLETED
+        task = self.db.execute(
+            select(Task).where(Task.id == task_id).with_for_update().execution_options(populate_existing=True)
+        ).scalar_one_or_none()
+        if not task:
+            raise TaskNotFound("Task not found")
+        if task.status != "PENDING":
+            raise TaskNotPending(f"Task is {task.status}")
+        
+        instance = self.db.query(ProcessInstance).get(task.process_instance_id)
+
+        self.apply_completion(task, instance, user_id, data)
+
+        self.commit(outcome=instance)
+        return instance
+
+    @profiling.operation("complete_tasks")
+    def complete_tasks(self, user_id: int, items: list):
+        """Complete many (task_id, data) pairs in one transaction.
+
+        Tasks and their instances are loaded with one query, history rows are
+        written with a single executemany INSERT and everything commits once.
+        Returns one result dict per item, in order.
+        """
+        task_ids = {task_id for task_id, _ in items}
+        rows = self.db.execute(
+            select(Task, ProcessInstance)
+            .join(ProcessInstance, Task.process_instance_id == ProcessInstance.id)
+            .where(Task.id.in_(task_ids))
+            .order_by(Task.id)  # consistent lock order across concurrent batches
+            .with_for_update(of=Task)
+            .execution_options(populate_existing=True)
+        ).all() if task_ids else []
+        loaded = {task.id: (task, instance) for task, instance in rows}
+
+        results = []
+        self.history_buffer = []
+        try:
+            for task_id, data in items:
+                if task_id not in loaded:
+                    results.append({"task_id": task_id, "status": "error", "detail": "Task not found"})
+                    continue
+                task, instance = loaded[task_id]
+                if task.status != "PENDING":
+                    results.append({"task_id": task_id, "status": "error", "detail": f"Task is {task.status}"})
+                    continue
+                self.apply_completion(task, instance, user_id, data)
+                results.append({"task_id": task_id, "status": "completed", "process_instance_id": instance.id})
+            self.flush_history()
+        finally:
+            self.history_buffer = None
+
+        self.commit()
+        return results
+
+    @profiling.operation("claim_task")
+    def claim_task(self, user_id: int):
+        """Assign the oldest unclaimed pending task of the user's role to them; None if there is none."""
+        user = user_directory.get(self.db, user_id)
+        if user is None:
+            raise UserNotFound("User not found")
+        unclaimed = select(Task).where(
+            Task.status == "PENDING", Task.assignee_role == user.role_name, Task.assignee_user_id.is_(None)
+        ).order_by(Task.id)
+
+        if self.db.get_bind().dialect.name == "postgresql":
+            # Rows locked by other claimers are skipped, not waited for
+            task = self.db.execute(unclaimed.limit(1).with_for_update(skip_locked=True)).scalar_one_or_none()
+            if task is not None:
+                task.assignee_user_id = user.id
+        else:
+            task = self.update_first(unclaimed, Task.assignee_user_id.is_(None), assignee_user_id=user.id)
+
+        if task is not None:
+            self.publish("task_claimed", task)
+            self.commit()
+        return task
+
+    def update_first(self, candidates, guard, **values):
+        # Conditional UPDATE per candidate: only one concurrent caller's guard still matches
+        while True:
+            task_ids = self.db.scalars(candidates.with_only_columns(Task.id).limit(CLAIM_CANDIDATES)).all()
+            if not task_ids:
+                return None
+            for task_id in task_ids:
+                updated = self.db.execute(
+                    update(Task)
+                    .where(Task.id == task_id, Task.status == "PENDING", guard)
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                if updated:
+                    return self.db.get(Task, task_id, populate_existing=True)
+
+    @profiling.operation("lease_service_task")
+    def lease_service_task(self, lease_seconds: float):
+        """Take the oldest due service task for `lease_seconds`; None if nothing is due.
+
+        The lease (run_after in the future) hides it from other workers; if this
+        worker dies, the task becomes due again when the lease runs out.
+        """
+        now = self.now()
+        lease_until = now + datetime.timedelta(seconds=lease_seconds)
+        is_due = or_(Task.run_after.is_(None), Task.run_after <= now)
+        due = select(Task).where(Task.status == "PENDING", Task.handler.is_not(None), is_due).order_by(Task.id)
+
+        if self.db.get_bind().dialect.name == "postgresql":
+            task = self.db.execute(due.limit(1).with_for_update(skip_locked=True)).scalar_one_or_none()
+            if task is not None:
+                task.attempts += 1
+                task.run_after = lease_until
+        else:
+            task = self.update_first(due, is_due, attempts=Task.attempts + 1, run_after=lease_until)
+        if task is None:
+            return None
+
+        instance = self.db.get(ProcessInstance, task.process_instance_id)
+        call = ServiceCall(task.id, instance.process_definition_key, task.task_definition_key,
+                           task.handler, task.attempts, dict(instance.variables or {}))
+        self.commit()
+        return call
+
+    def locked_service_task(self, call: ServiceCall):
+        task = self.db.execute(
+            select(Task).where(Task.id == call.task_id).with_for_update().execution_options(populate_existing=True)
+        ).scalar_one_or_none()
+        # A different attempt number means the lease expired and another worker took over
+        if task is None or task.status != "PENDING" or task.attempts != call.attempt:
+            return None
+        return task
+
+    @profiling.operation("finish_service_task")
+    def finish_service_task(self, call: ServiceCall, data: dict):
+        """Complete a leased service task with the handler's variables and route on."""
+        task = self.locked_service_task(call)
+        if task is None:
+            return False
+        instance = self.db.query(ProcessInstance).get(task.process_instance_id)
+        self.apply_completion(task, instance, None, data)
+        self.commit()
+        return True
+
+    @profiling.operation("fail_service_task")
+    def fail_service_task(self, call: ServiceCall, error: str, retry_in: float = None):
+        """Record a failed run: due again after `retry_in` seconds, or FAILED when None."""
+        task = self.locked_service_task(call)
+        if task is None:
+            return False
+        task.last_error = error
+        if retry_in is None:
+            task.status = "FAILED"
+            self.log_history(task.process_instance_id, task.id, None, "SERVICE_TASK_FAILED",
+                             f"{task.name} failed after {task.attempts} attempts: {error}")
+        else:
+            task.run_after = self.now() + datetime.timedelta(seconds=retry_in)
+        self.commit()
+        return True
+
+    @profiling.operation("escalate_overdue")
+    def escalate_overdue(self, now, limit, repeat_hours, max_level):
+        """Escalate up to `limit` overdue pending tasks (oldest deadline first); returns how many.
+
+        Each one gets an ESCALATED history entry and a task_overdue event, and a
+        claim is released back to the role queue so a colleague can pick it up.
+        It is due again after `repeat_hours`, until `max_level` escalations.
+        """
+        overdue = select(Task).where(
+            Task.status == "PENDING", Task.due_at.is_not(None), Task.due_at <= now
+        ).order_by(Task.due_at, Task.id).limit(limit)
+        if self.db.get_bind().dialect.name == "postgresql":
+            overdue = overdue.with_for_update(skip_locked=True)  # replicas split the batch
+        tasks = self.db.execute(overdue.execution_options(populate_existing=True)).scalars().all()
+
+        for task in tasks:
+            overdue_since = task.due_at
+            task.escalation_level += 1
+            task.due_at = now + datetime.timedelta(hours=repeat_hours) if task.escalation_level < max_level else None
+            released_user_id = task.assignee_user_id if task.assignee_role else None
+            if released_user_id is not None:
+                task.assignee_user_id = None
+            comment = f"{task.name} overdue since {overdue_since:%Y-%m-%d %H:%M} (escalation {task.escalation_level})"
+            if released_user_id is not None:
+                comment += ", returned to the role queue"
+            self.log_history(task.process_instance_id, task.id, None, "ESCALATED", comment)
+            self.publish("task_overdue", task, released_user_id=released_user_id,
+                         escalation_level=task.escalation_level)
+        if tasks:
+            self.commit()
+        return len(tasks)
+
+    def now(self):
+        """Database time (see db_now), for every timestamp compared with created_at or with each other."""
+        if self.db_time is None:
+            self.db_time = self.db.scalar(select(db_now()))
+        return self.db_time
+
+    def publish(self, kind, task, **extra):
+        self.task_changes.append((kind, task, extra))
+
+    @profiling.phase("commit")
+    def commit(self, outcome=None):
+        # ProcessInstance.version makes instance UPDATEs compare-and-swap (see models.py)
+        changes, self.task_changes = self.task_changes, []
+        try:
+            if changes:
+                self.db.flush()  # assign ids to new tasks
+            self.record_kpis()
+            if self.idempotency is not None:
+                self.idempotency.stage(self.db, outcome)
+            events = [task_event(kind, task, **extra) for kind, task, extra in changes]
+            task_events.before_commit(self.db, events)
+            self.db.commit()
+        except StaleDataError as e:
+            self.db.rollback()
+            raise ConcurrencyConflict(str(e)) from e
+        except DBAPIError as e:
+            self.db.rollback()
+            sqlstate = getattr(e.orig, "sqlstate", None) or getattr(e.orig, "pgcode", None)
+            if sqlstate in RETRYABLE_SQLSTATES:
+                raise ConcurrencyConflict(str(e)) from e
+            raise
+        finally:
+            self.db_time = None
+        task_events.after_commit(self.db, events)
+
+    @profiling.phase("record_kpis")
+    def record_kpis(self):
+        self.kpis.flush(self.db)
+
+    def apply_completion(self, task, instance, user_id, data):
+        profiling.label(instance.process_definition_key, instance.id)
+        # Update Variables
+        delta = changed_keys(self.variables_of(instance), data)
+        self.merge_variables(instance, delta)
+        
+        # Log History: only the changed keys, plus the full variables every CHECKPOINT_INTERVAL changes
+        checkpoint = next_checkpoint(instance, self.variables_of(instance), delta)
+        self.log_history(instance.id, task.id, user_id, "COMPLETE_TASK", f"Completed {task.name}",
+                         delta=delta or None, checkpoint=checkpoint)
+        
+        # Mark Task Completed
+        task.status = "COMPLETED"
+        self.publish("task_completed", task)
+        self.kpis.add(instance.process_definition_key, task.task_definition_key, task.assignee_role,
+                      task.created_at, self.now())
+        
+        # Calculate Next Step
+        self.route_process(instance, task.task_definition_key)
+
+    def variables_of(self, instance):
+        return self.variables.get(instance.id, instance.variables or {})
+
+    @profiling.phase("merge_variables")
+    def merge_variables(self, instance, data):
+        self.variables[instance.id] = {**self.variables_of(instance), **data}
+        if self.jsonb and data:
+            # UPDATE ... SET variables = variables || :delta, merged in place by Postgres
+            delta = self.variable_deltas.setdefault(instance.id, {})
+            delta.update(data)
+            instance.variables = type_coerce(ProcessInstance.variables, JSONB).concat(delta)
+        else:
+            instance.variables = self.variables[instance.id]
+
+    @profiling.phase("create_task")
+    def create_task(self, instance_id, task_key, name, role=None, user_id=None, handler=None, due_hours=None):
+        due_at = self.now() + datetime.timedelta(hours=due_hours) if due_hours else None
+        new_task = Task(
+            process_instance_id=instance_id,
+            task_definition_key=task_key,
+            name=name,
+            assignee_role=role,
+            assignee_user_id=user_id,
+            handler=handler,
+            due_at=due_at,
+            status="PENDING"
+        )
+        self.db.add(new_task)
+        self.publish("task_created", new_task)
+        return new_task
+
+    @profiling.phase("log_history")
+    def log_history(self, instance_id, task_id, user_id, action, comment, delta=None, checkpoint=None):
+        # Fetch user name for snapshot
+        user_name = "System"
+        if user_id:
+            u = user_directory.get(self.db, user_id)
+            if u: user_name = u.full_name
+
+        log = dict(
+            process_instance_id=instance_id,
+            task_id=task_id,
+            user_id=user_id,
+            user_name=user_name,
+            action=action,
+            comment=comment,
+            variables_delta=delta,
+            variables_checkpoint=checkpoint,
+        )
+        if self.history_buffer is not None:
+            self.history_buffer.append(log)
+        else:
+            self.db.add(HistoryLog(**log))
+
+    def flush_history(self):
+        if self.history_buffer:
+            self.db.execute(insert(HistoryLog), self.history_buffer)
+            self.history_buffer = []
+
+    @profiling.phase("route_process")
+    def route_process(self, instance, completed_task_key):
+        # O(1) lookup in the transition table compiled from the .bpmn files
+        transition = self.models.next(instance.process_definition_key, completed_task_key)
+        self.follow_transition(instance, transition)
+
+    def follow_transition(self, instance, transition):
+        step = resolve(transition, self.variables_of(instance))
+        if isinstance(step, TaskStep):
+            self.create_task(instance.id, step.key, step.name, role=step.role, handler=step.handler,
+                             due_hours=step.due_hours)
+        elif isinstance(step, EndStep):
+            self.end_process(instance, step.status)
+
+    def end_process(self, instance, status):
+        instance.status = status
+        instance.ended_at = self.now()
+        self.kpis.add(instance.process_definition_key, INSTANCE, status, instance.created_at, instance.ended_at)
+        self.log_history(instance.id, None, None, "END_PROCESS", f"Process ended with status {status}")
+
+
+
+class AsyncProcessEngine:
+    """ProcessEngine for an AsyncSession.
+
+    The routing logic stays in ProcessEngine; each operation runs on the
+    session's sync facade via run_sync, so the driver I/O (asyncpg) is awaited
+    on the event loop instead of blocking a threadpool worker.
+    """
+
+    def __init__(self, db: AsyncSession, idempotency=None):
+        self.db = db
+        self.idempotency = idempotency
+
+    async def start_process(self, process_key: str, user_id: int, initial_data: dict):
+        return await self.db.run_sync(
+            lambda s: ProcessEngine(s, self.idempotency).start_process(process_key, user_id, initial_data))
+
+    async def complete_task(self, task_id: int, user_id: int, data: dict):
+        return await self.retrying(lambda s: ProcessEngine(s, self.idempotency).complete_task(task_id, user_id, data))
+
+    async def claim_task(self, user_id: int):
+        task = await self.retrying(lambda s: ProcessEngine(s).claim_task(user_id))
+        return task.id if task is not None else None
+
+    async def lease_service_task(self, lease_seconds: float):
+        return await self.retrying(lambda s: ProcessEngine(s).lease_service_task(lease_seconds))
+
+    async def finish_service_task(self, call: ServiceCall, data: dict):
+        return await self.retrying(lambda s: ProcessEngine(s).finish_service_task(call, data))
+
+    async def fail_service_task(self, call: ServiceCall, error: str, retry_in: float = None):
+        return await self.retrying(lambda s: ProcessEngine(s).fail_service_task(call, error, retry_in))
+
+    async def escalate_overdue(self, now, limit, repeat_hours, max_level):
+        return await self.retrying(lambda s: ProcessEngine(s).escalate_overdue(now, limit, repeat_hours, max_level))
+
+    async def complete_tasks(self, user_id: int, items: list):
+        return await self.retrying(lambda s: ProcessEngine(s).complete_tasks(user_id, items))
+
+    async def retrying(self, operation):
+        # Re-run the whole transaction on a lost compare-and-swap or deadlock, with jittered backoff
+        for attempt in range(RETRY_ATTEMPTS):
+            try:
+                return await self.db.run_sync(operation)
+            except ConcurrencyConflict:
+                if attempt == RETRY_ATTEMPTS - 1:
+                    raise
+                await asyncio.sleep(RETRY_BASE_DELAY * (2 ** attempt) * (1 + random.random()))
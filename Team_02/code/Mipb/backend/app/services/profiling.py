@@ -0,0 +1,150 @@
+import functools
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.db.pool import env_flag
+from app.services.metrics import Histogram
+
+# ENGINE_PROFILING=0 leaves the ProcessEngine methods undecorated (no overhead at all)
+ENABLED = env_flag("ENGINE_PROFILING", "true")
+# Log operations slower than this (seconds) with their instances and SQL; 0 = off
+SLOW_TRANSITION_SECONDS = float(os.getenv("SLOW_TRANSITION_SECONDS", "0"))
+
+STATEMENT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 500)
+
+logger = logging.getLogger(__name__)
+
+current_profile = ContextVar("engine_profile", default=None)
+
+
+class Profile:
+    """Phases and SQL of one engine operation (start_process, complete_task, ...)."""
+
+    def __init__(self, operation):
+        self.operation = operation
+        self.process_keys = set()
+        self.instance_ids = set()
+        self.phases = []  # (phase, seconds, statements), phases are inclusive of nested ones
+        self.open_counts = []  # statement counters of the phases currently running
+        self.statements = 0
+        self.sql = [] if SLOW_TRANSITION_SECONDS else None
+
+    @property
+    def process_key(self):
+        if len(self.process_keys) == 1:
+            return next(iter(self.process_keys))
+        return "mixed" if self.process_keys else "unknown"
+
+    def count(self, statement):
+        self.statements += 1
+        for i in range(len(self.open_counts)):
+            self.open_counts[i] += 1
+        if self.sql is not None:
+            self.sql.append(statement)
+
+
+class EngineStats:
+    """Per process definition and phase: duration and SQL statement histograms."""
+
+    def __init__(self):
+        self.histograms = {}  # (process_key, phase) -> (seconds, statements)
+        self.lock = threading.Lock()
+
+    def histograms_for(self, process_key, phase):
+        key = (process_key, phase)
+        with self.lock:
+            if key not in self.histograms:
+                self.histograms[key] = (Histogram(), Histogram(STATEMENT_BUCKETS))
+            return self.histograms[key]
+
+    def record(self, profile, seconds):
+        for phase, phase_seconds, statements in [*profile.phases, (profile.operation, seconds, profile.statements)]:
+            durations, counts = self.histograms_for(profile.process_key, phase)
+            durations.observe(phase_seconds)
+            counts.observe(statements)
+        if SLOW_TRANSITION_SECONDS and seconds >= SLOW_TRANSITION_SECONDS:
+            logger.warning(
+                "Slow %s (%s) %.3fs instances=%s phases=%s statements=%s",
+                profile.operation, profile.process_key, seconds, sorted(profile.instance_ids),
+                [(phase, round(s, 4), n) for phase, s, n in profile.phases], profile.sql,
+            )
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            items = list(self.histograms.items())
+        result = {"enabled": ENABLED, "processes": {}}
+        for (process_key, phase), (durations, counts) in sorted(items):
+            result["processes"].setdefault(process_key, {})[phase] = {
+                "seconds": durations.snapshot(),
+                "statements": counts.snapshot(),
+            }
+        return result
+
+
+engine_stats = EngineStats()
+
+
+def operation(name):
+    """Outermost timer of an engine call; phases and SQL inside it are attributed to it."""
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if current_profile.get() is not None:
+                return fn(*args, **kwargs)
+            profile = Profile(name)
+            token = current_profile.set(profile)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start
+                current_profile.reset(token)
+                engine_stats.record(profile, seconds)
+        return wrapper
+    return decorate
+
+
+def phase(name):
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            profile = current_profile.get()
+            if profile is None:
+                return fn(*args, **kwargs)
+            profile.open_counts.append(0)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profile.phases.append((name, time.perf_counter() - start, profile.open_counts.pop()))
+        return wrapper
+    return decorate
+
+
+def label(process_key, instance_id=None):
+    """Attach the process definition (and instance) to the running operation."""
+    profile = current_profile.get()
+    if profile is not None:
+        profile.process_keys.add(process_key)
+        if instance_id is not None:
+            profile.instance_ids.add(instance_id)
+
+
+if ENABLED:
+    @event.listens_for(Engine, "before_cursor_execute")
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        profile = current_profile.get()
+        if profile is not None:
+            profile.count(statement)
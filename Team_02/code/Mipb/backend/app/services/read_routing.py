@@ -0,0 +1,78 @@
+import os
+import threading
+import time
+
+from fastapi import Request
+
+from app.db.session import AsyncSessionLocal, ReadSessionLocal, read_async_engine
+from app.services.metrics import Counters
+from app.services.task_events import task_events
+from app.services.user_directory import user_directory
+
+# How long reads touching something just written go to the primary; must exceed the replica lag
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+
+class RecentWrites:
+    """Users, role queues and process instances changed in the last `window` seconds.
+
+    Fed by the task events, which reach every worker (Postgres LISTEN/NOTIFY)
+    and are applied locally right after the commit. So a user completing or
+    claiming a task reads their worklist and the instance history from the
+    primary until the replica has caught up.
+    """
+
+    def __init__(self, window: float = READ_YOUR_WRITES_SECONDS):
+        self.window = window
+        self.until = {}  # ("user" | "role" | "instance", str(value)) -> monotonic deadline
+        self.lock = threading.Lock()
+
+    def mark(self, *keys):
+        deadline = time.monotonic() + self.window
+        with self.lock:
+            for key in keys:
+                self.until[key] = deadline
+            if len(self.until) > 10000:
+                now = time.monotonic()
+                self.until = {k: t for k, t in self.until.items() if t > now}
+
+    def recent(self, key) -> bool:
+        with self.lock:
+            deadline = self.until.get(key)
+        return deadline is not None and deadline > time.monotonic()
+
+    def on_event(self, event):
+        keys = [("role", event.get("assignee_role")), ("instance", event.get("process_instance_id"))]
+        keys += [("user", event.get(field)) for field in ("assignee_user_id", "released_user_id")]
+        self.mark(*((kind, str(value)) for kind, value in keys if value is not None))
+
+    def needs_primary(self, path_params) -> bool:
+        # Path parameters are still the raw strings here (validated by the route afterwards)
+        if "process_id" in path_params and self.recent(("instance", path_params["process_id"])):
+            return True
+        user_id = path_params.get("user_id")
+        if user_id is not None:
+            entry = user_directory.cached(int(user_id)) if user_id.isdigit() else None
+            # Role unknown without a lookup: take the safe side
+            return entry is None or self.recent(("user", user_id)) or self.recent(("role", entry.role_name))
+        return False
+
+
+recent_writes = RecentWrites()
+task_events.add_listener(recent_writes.on_event)
+
+routing = Counters("primary", "replica")
+
+
+async def get_read_db(request: Request):
+    """Session for read-only routes: the replica, unless this request may need a recent write."""
+    factory = ReadSessionLocal
+    if read_async_engine is None or recent_writes.needs_primary(request.path_params):
+        factory = AsyncSessionLocal
+    routing.inc("primary" if factory is AsyncSessionLocal else "replica")
+    async with factory() as db:
+        yield db
+
+
+def snapshot() -> dict:
+    return {"configured": read_async_engine is not None, "window_seconds": READ_YOUR_WRITES_SECONDS, **routing.snapshot()}
@@ -0,0 +1,24 @@
+from fastapi.responses import ORJSONResponse
+
+
+def row_dicts(rows):
+    """Projected query rows as dicts; zips the keys once (Row._asdict() and attribute access cost more per row)."""
+    if not rows or isinstance(rows[0], dict):
+        return list(rows)
+    keys = [str(key) for key in rows[0]._fields]  # plain str: orjson rejects str subclasses (quoted_name)
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def check_fields(model, keys):
+    """Fail at import if a column projection drifts from the response model it is rendered as."""
+    if list(model.model_fields) != list(keys):
+        raise TypeError(f"{model.__name__} fields {list(model.model_fields)} != projected columns {list(keys)}")
+
+
+def json_response(content, headers=None):
+    """Render with orjson directly, skipping FastAPI's response_model validation and jsonable_encoder.
+
+    For large lists built from our own column projections only (see
+    check_fields); keep response_model on the route for the OpenAPI schema.
+    """
+    return ORJSONResponse(content, headers=headers)
@@ -0,0 +1,95 @@
+import asyncio
+import datetime
+import inspect
+import os
+
+from app.db.session import AsyncSessionLocal
+from app.services.jobs import PeriodicJob
+from app.services.metrics import Counters
+from app.services.process_engine import AsyncProcessEngine
+
+WORKERS = int(os.getenv("SERVICE_TASK_WORKERS", "2"))  # 0 = no automatic steps in this process
+POLL_SECONDS = float(os.getenv("SERVICE_TASK_POLL_SECONDS", "1"))
+LEASE_SECONDS = float(os.getenv("SERVICE_TASK_LEASE_SECONDS", "60"))
+MAX_ATTEMPTS = int(os.getenv("SERVICE_TASK_MAX_ATTEMPTS", "5"))
+BACKOFF_SECONDS = float(os.getenv("SERVICE_TASK_BACKOFF_SECONDS", "2"))
+MAX_BACKOFF_SECONDS = 300
+
+# handler name (bpmn_loader.SERVICE_TASKS) -> callable(variables, call) -> dict of variables to merge.
+# Plain functions run in a thread, coroutine functions on the event loop.
+HANDLERS = {}
+
+
+def handler(name):
+    def register(fn):
+        HANDLERS[name] = fn
+        return fn
+    return register
+
+
+def now_iso():
+    return datetime.datetime.utcnow().isoformat(timespec="seconds")
+
+
+@handler("notify_head_ou")
+def notify_head_ou(variables, call):
+    # Leave request: record that the Head of O.U. was told the final decision (mail gateway hooks in here)
+    return {"head_ou_informed_at": now_iso(), "head_ou_informed_decision": variables.get("final_decision")}
+
+
+@handler("transfer_to_external")
+def transfer_to_external(variables, call):
+    # Decorations: accepted applications are handed over to the external awarding body
+    return {"external_transfer_at": now_iso()}
+
+
+def retry_delay(attempt):
+    return min(MAX_BACKOFF_SECONDS, BACKOFF_SECONDS * 2 ** (attempt - 1))
+
+
+class ServiceTaskWorkers(PeriodicJob):
+    """Pool of asyncio workers running automatic BPMN steps.
+
+    Each run leases one due task (own transaction), calls its handler outside
+    any transaction, then completes and routes it through ProcessEngine. A
+    failing handler is retried with exponential backoff up to MAX_ATTEMPTS
+    runs, after which the task is marked FAILED and logged in the history.
+    """
+
+    name = "Service task worker"
+
+    def __init__(self, size=WORKERS):
+        super().__init__(POLL_SECONDS, workers=size)
+        self.counters = Counters("runs", "succeeded", "retried", "failed", "lease_lost")
+
+    async def run_once(self) -> bool:
+        """Run one due service task; False if there was none."""
+        async with AsyncSessionLocal() as db:
+            call = await AsyncProcessEngine(db).lease_service_task(LEASE_SECONDS)
+        if call is None:
+            return False
+        self.counters.inc("runs")
+        try:
+            fn = HANDLERS.get(call.handler)
+            if fn is None:
+                raise LookupError(f"No handler registered for {call.handler!r}")
+            if inspect.iscoroutinefunction(fn):
+                result = await fn(call.variables, call)
+            else:
+                result = await asyncio.to_thread(fn, call.variables, call)
+        except Exception as e:
+            retry_in = retry_delay(call.attempt) if call.attempt < MAX_ATTEMPTS else None
+            async with AsyncSessionLocal() as db:
+                recorded = await AsyncProcessEngine(db).fail_service_task(call, f"{type(e).__name__}: {e}", retry_in)
+            self.counters.inc("lease_lost" if not recorded else "retried" if retry_in is not None else "failed")
+            return True
+        async with AsyncSessionLocal() as db:
+            finished = await AsyncProcessEngine(db).finish_service_task(call, result or {})
+        self.counters.inc("succeeded" if finished else "lease_lost")
+        return True
+
+    def snapshot(self) -> dict:
+        return {"workers": len(self.tasks), "handlers": sorted(HANDLERS), **self.counters.snapshot()}
+
+
+service_workers = ServiceTaskWorkers()
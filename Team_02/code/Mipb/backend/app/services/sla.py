@@ -0,0 +1,54 @@
+import os
+
+from sqlalchemy import select
+
+from app.db.models import db_now
+from app.db.session import AsyncSessionLocal
+from app.services.jobs import PeriodicJob
+from app.services.metrics import Counters
+from app.services.process_engine import AsyncProcessEngine
+
+INTERVAL_SECONDS = float(os.getenv("ESCALATION_INTERVAL_SECONDS", "60"))  # 0 = no scheduler in this process
+BATCH_SIZE = int(os.getenv("ESCALATION_BATCH_SIZE", "100"))
+# An escalated task is due again after this long, up to ESCALATION_MAX_LEVEL escalations
+REPEAT_HOURS = float(os.getenv("ESCALATION_REPEAT_HOURS", "24"))
+MAX_LEVEL = int(os.getenv("ESCALATION_MAX_LEVEL", "3"))
+
+
+class EscalationScheduler(PeriodicJob):
+    """Periodically escalates pending tasks whose SLA deadline (Task.due_at) has passed.
+
+    Overdue tasks are read through the partial due_at index in batches of
+    BATCH_SIZE, one transaction each; on Postgres the rows are locked with
+    SKIP LOCKED, so every worker and replica can run a scheduler.
+    """
+
+    name = "Escalation scheduler"
+
+    def __init__(self, interval=INTERVAL_SECONDS):
+        super().__init__(interval)
+        self.counters = Counters("runs", "escalated")
+        self.last_run_at = None
+
+    async def run_once(self) -> int:
+        """Escalate everything overdue right now; returns how many tasks."""
+        # Deadlines are set on the database clock (ProcessEngine.now)
+        async with AsyncSessionLocal() as db:
+            now = await db.scalar(select(db_now()))
+        total = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                count = await AsyncProcessEngine(db).escalate_overdue(now, BATCH_SIZE, REPEAT_HOURS, MAX_LEVEL)
+            total += count
+            if count < BATCH_SIZE:
+                break
+        self.counters.inc("runs")
+        self.counters.inc("escalated", total)
+        self.last_run_at = now.isoformat(timespec="seconds")
+        return total
+
+    def snapshot(self) -> dict:
+        return {"running": self.running, "last_run_at": self.last_run_at, **self.counters.snapshot()}
+
+
+escalation_scheduler = EscalationScheduler()
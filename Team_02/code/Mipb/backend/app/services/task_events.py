@@ -0,0 +1,141 @@
+import asyncio
+import json
+
+from sqlalchemy import Text, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+
+# Postgres NOTIFY channel that carries task events between workers/replicas
+CHANNEL = "mipb_task_events"
+QUEUE_SIZE = 1000
+LISTEN_RETRY_SECONDS = 5
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7900
+
+
+def task_event(kind, task, **extra):
+    return {
+        "type": kind,  # task_created, task_claimed, task_completed, task_overdue
+        "task_id": task.id,
+        "process_instance_id": task.process_instance_id,
+        "task_definition_key": task.task_definition_key,
+        "name": task.name,
+        "assignee_role": task.assignee_role,
+        "assignee_user_id": task.assignee_user_id,
+        **extra,
+    }
+
+
+def payloads(events):
+    """JSON arrays of events, each small enough for one NOTIFY."""
+    chunks, chunk, size = [], [], 2
+    for event in events:
+        encoded = json.dumps(event)  # ASCII-only, so len() is the byte count
+        if chunk and size + len(encoded) + 1 > MAX_PAYLOAD_BYTES:
+            chunks.append(f"[{','.join(chunk)}]")
+            chunk, size = [], 2
+        chunk.append(encoded)
+        size += len(encoded) + 1
+    if chunk:
+        chunks.append(f"[{','.join(chunk)}]")
+    return chunks
+
+
+class Subscription:
+    def __init__(self, role, user_id):
+        self.role = role
+        self.user_id = user_id
+        self.queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.loop = asyncio.get_running_loop()
+
+    def matches(self, event):
+        return event.get("assignee_role") == self.role or (
+            self.user_id is not None and event.get("assignee_user_id") == self.user_id
+        )
+
+    def put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            pass  # slow client: it resyncs with a full worklist fetch anyway
+
+
+class TaskEventBroker:
+    """Fans task events out to worklist subscribers (SSE connections).
+
+    On PostgreSQL, events are sent with pg_notify inside the committing
+    transaction (one statement per commit, events batched into JSON arrays),
+    so they are delivered only if the commit succeeds, and every worker
+    receives them through its LISTEN connection. On other
+    databases they go to this process's subscribers after the commit.
+    """
+
+    def __init__(self):
+        self.subscribers = set()
+        self.listeners = []  # in-process callbacks (cache invalidation), called for every event
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def subscribe(self, role, user_id=None):
+        sub = Subscription(role, user_id)
+        self.subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        self.subscribers.discard(sub)
+
+    def notify_listeners(self, event):
+        for listener in self.listeners:
+            listener(event)
+
+    def dispatch(self, event):
+        self.notify_listeners(event)
+        for sub in list(self.subscribers):
+            if sub.matches(event):
+                sub.loop.call_soon_threadsafe(sub.put, event)
+
+    @staticmethod
+    def uses_notify(db):
+        return db.get_bind().dialect.name == "postgresql"
+
+    def before_commit(self, db, events):
+        if events and self.uses_notify(db):
+            payload = func.unnest(bindparam("payloads", payloads(events), type_=ARRAY(Text))).column_valued("payload")
+            db.execute(select(func.pg_notify(CHANNEL, payload)))
+
+    def after_commit(self, db, events):
+        notify = self.uses_notify(db) if events else False
+        for event in events:
+            if notify:
+                # Subscribers get it through LISTEN; listeners run now so this worker reads its own writes
+                self.notify_listeners(event)
+            else:
+                self.dispatch(event)
+
+    async def listen(self, dsn):
+        # One dedicated asyncpg connection per worker; reconnects if the DB goes away
+        import asyncpg
+
+        def on_notify(connection, pid, channel, payload):
+            events = json.loads(payload)
+            # A single object comes from a worker still running the per-event version
+            for event in events if isinstance(events, list) else [events]:
+                self.dispatch(event)
+
+        while True:
+            try:
+                conn = await asyncpg.connect(dsn)
+                try:
+                    await conn.add_listener(CHANNEL, on_notify)
+                    while not conn.is_closed():
+                        await asyncio.sleep(LISTEN_RETRY_SECONDS)
+                finally:
+                    await conn.close()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Task event listener disconnected: {e}")
+            await asyncio.sleep(LISTEN_RETRY_SECONDS)
+
+
+task_events = TaskEventBroker()
@@ -0,0 +1,125 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.db.models import User
+from app.services.metrics import Counters
+
+
+class UserEntry(NamedTuple):
+    id: int
+    username: str
+    full_name: str
+    role_name: str
+
+
+def to_entry(user: User) -> UserEntry:
+    return UserEntry(user.id, user.username, user.full_name, user.role_name)
+
+
+class UserDirectory:
+    """Process-wide LRU cache of users (id -> name/role) with a TTL.
+
+    Users change rarely, so lookups for history snapshots and worklist role
+    filters are served from memory. Entries are dropped when a User row is
+    inserted, updated or deleted through this process's ORM (see the hooks
+    below) or via invalidate(). The TTL bounds how long other workers and
+    replicas, or edits made directly in the database, keep an old name/role.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()  # user id -> (expires_at, UserEntry)
+        self.listing = None  # cached /api/auth/users result: (expires_at, entries)
+        self.lock = threading.Lock()
+        self.counters = Counters("hits", "misses", "invalidations")
+
+    def cached(self, user_id: int) -> Optional[UserEntry]:
+        with self.lock:
+            item = self.entries.get(user_id)
+            entry = None
+            if item is not None and item[0] < time.monotonic():
+                del self.entries[user_id]
+            elif item is not None:
+                entry = item[1]
+                self.entries.move_to_end(user_id)
+        self.counters.inc("hits" if entry is not None else "misses")
+        return entry
+
+    def store(self, entry: UserEntry) -> UserEntry:
+        with self.lock:
+            self.entries[entry.id] = (time.monotonic() + self.ttl, entry)
+            self.entries.move_to_end(entry.id)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return entry
+
+    def get(self, db: Session, user_id: int) -> Optional[UserEntry]:
+        entry = self.cached(user_id)
+        if entry is None:
+            user = db.get(User, user_id)
+            entry = self.store(to_entry(user)) if user else None
+        return entry
+
+    async def aget(self, db, user_id: int) -> Optional[UserEntry]:
+        entry = self.cached(user_id)
+        if entry is None:
+            user = await db.get(User, user_id)
+            entry = self.store(to_entry(user)) if user else None
+        return entry
+
+    async def aall(self, db) -> list:
+        listing = self.listing
+        if listing is not None and listing[0] >= time.monotonic():
+            self.counters.inc("hits")
+            return list(listing[1])
+        self.counters.inc("misses")
+        entries = tuple(to_entry(u) for u in (await db.execute(select(User).order_by(User.id))).scalars())
+        with self.lock:
+            self.listing = (time.monotonic() + self.ttl, entries)
+        return list(entries)
+
+    def invalidate(self, user_id: Optional[int] = None):
+        with self.lock:
+            if user_id is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(user_id, None)
+            self.listing = None
+        self.counters.inc("invalidations")
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            size = len(self.entries)
+        return {"size": size, "maxsize": self.maxsize, "ttl": self.ttl, **self.counters.snapshot()}
+
+
+user_directory = UserDirectory(
+    maxsize=int(os.getenv("USER_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("USER_CACHE_TTL", "60")),
+)
+
+
+# Explicit invalidation: remember which users a session changed, drop them once it commits
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def remember_changed_user(mapper, connection, target):
+    Session.object_session(target).info.setdefault("changed_user_ids", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_changed_users(session):
+    for user_id in session.info.pop("changed_user_ids", ()):
+        user_directory.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def forget_changed_users(session):
+    session.info.pop("changed_user_ids", None)
@@ -0,0 +1,62 @@
+import os
+
+from sqlalchemy import func, select
+
+from app.db.models import HistoryLog
+
+# A full copy of the variables is stored on every Nth history entry that changes them
+CHECKPOINT_INTERVAL = int(os.getenv("HISTORY_CHECKPOINT_INTERVAL", "10"))
+
+
+def changed_keys(current: dict, data: dict) -> dict:
+    """The part of `data` that actually changes `current` (variables are only ever merged)."""
+    missing = object()
+    return {k: v for k, v in (data or {}).items() if current.get(k, missing) != v}
+
+
+def next_checkpoint(instance, variables: dict, delta: dict):
+    """Full variables to store with this entry, or None if its delta is enough."""
+    if not delta:
+        return None
+    count = (instance.deltas_since_checkpoint or 0) + 1
+    if count >= CHECKPOINT_INTERVAL:
+        instance.deltas_since_checkpoint = 0
+        return dict(variables)
+    instance.deltas_since_checkpoint = count
+    return None
+
+
+async def variable_snapshots(db, process_id: int, log_ids, logs=HistoryLog.__table__) -> dict:
+    """Variables after each of `log_ids` (history id -> dict), replayed from the nearest checkpoint.
+
+    Entries are replayed in id order, which is their commit order for one
+    instance. Instances recorded before deltas existed have no checkpoint and
+    get None. `logs` is the history table the instance lives in (hot or archived).
+    """
+    if not log_ids:
+        return {}
+    first, last = min(log_ids), max(log_ids)
+    checkpoints = logs.alias()
+    checkpoint_id = (
+        select(func.coalesce(func.max(checkpoints.c.id), 0))
+        .where(checkpoints.c.process_instance_id == process_id)
+        .where(checkpoints.c.variables_checkpoint.is_not(None))
+        .where(checkpoints.c.id <= first)
+        .scalar_subquery()
+    )
+    rows = await db.execute(
+        select(logs.c.id, logs.c.variables_delta, logs.c.variables_checkpoint)
+        .where(logs.c.process_instance_id == process_id)
+        .where(logs.c.id >= checkpoint_id, logs.c.id <= last)
+        .order_by(logs.c.id)
+    )
+    wanted = set(log_ids)
+    snapshots, state = {}, None
+    for log_id, delta, checkpoint in rows:
+        if checkpoint is not None:
+            state = checkpoint
+        elif delta and state is not None:
+            state = {**state, **delta}  # unchanged values are shared with the previous snapshot
+        if log_id in wanted:
+            snapshots[log_id] = state
+    return snapshots
@@ -0,0 +1,167 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import select
+
+from app.db.models import ProcessInstance, Task
+from app.services.metrics import Counters
+from app.services.serialization import row_dicts
+from app.services.task_events import task_events
+
+# Marks a queue too long to keep in memory; readers fall back to the paginated query
+OVERSIZED = "oversized"
+
+WORKLIST_COLUMNS = (
+    Task.id,
+    Task.name,
+    Task.task_definition_key,
+    Task.assignee_role,
+    Task.assignee_user_id,
+    Task.created_at,
+    Task.due_at,
+    Task.process_instance_id,
+    ProcessInstance.process_definition_key,
+    ProcessInstance.variables,
+)
+
+
+def pending_tasks_query():
+    # Single joined, column-projected query (no per-row lazy loads of process_instance)
+    return select(*WORKLIST_COLUMNS).join(
+        ProcessInstance, Task.process_instance_id == ProcessInstance.id
+    ).where(Task.status == "PENDING")
+
+
+class MemoryBackend:
+    """In-process LRU with a TTL.
+
+    A backend is anything with get(key) -> value or None, set(key, value),
+    delete(key), clear(), size() and maxsize; a shared store (e.g. Redis) can
+    be plugged into WorklistCache the same way. The TTL only bounds staleness
+    if an invalidation is missed (e.g. while the LISTEN connection reconnects).
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> (expires_at, value)
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            item = self.entries.get(key)
+            if item is None:
+                return None
+            if item[0] < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return item[1]
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def size(self) -> int:
+        with self.lock:
+            return len(self.entries)
+
+
+class WorklistCache:
+    """Read-through cache of pending-task lists, one entry per role and per assignee.
+
+    A user's worklist is the merge of their role's unclaimed queue and the
+    tasks assigned to (or claimed by) them. Entries are dropped on every task event for that role/user:
+    locally right after the commit, and on the other workers and replicas
+    through the task event channel (Postgres LISTEN/NOTIFY).
+    """
+
+    def __init__(self, backend, max_rows: int = 5000):
+        self.backend = backend
+        self.max_rows = max_rows
+        self.generations = {}  # key -> bumped on invalidation; stops a slow read storing stale rows
+        self.lock = threading.Lock()
+        self.counters = Counters("hits", "misses", "invalidations", "oversized")
+
+    def generation(self, key):
+        with self.lock:
+            return self.generations.get(key, 0)
+
+    async def load(self, db, key, stmt):
+        rows = self.backend.get(key)
+        if rows is not None:
+            self.counters.inc("hits")
+            return rows
+        self.counters.inc("misses")
+        generation = self.generation(key)
+        result = (await db.execute(stmt.order_by(Task.id).limit(self.max_rows + 1))).all()
+        rows = OVERSIZED if len(result) > self.max_rows else tuple(row_dicts(result))
+        if rows is OVERSIZED:
+            self.counters.inc("oversized")
+        if self.generation(key) == generation:
+            self.backend.set(key, rows)
+        return rows
+
+    async def worklist(self, db, user):
+        """Pending tasks for the user's role or assigned to them, ordered by id; None if too long to cache."""
+        by_role = await self.load(db, ("role", user.role_name), pending_tasks_query().where(
+            Task.assignee_role == user.role_name, Task.assignee_user_id.is_(None)))
+        if by_role is OVERSIZED:
+            return None
+        by_user = await self.load(db, ("user", user.id), pending_tasks_query().where(Task.assignee_user_id == user.id))
+        if by_user is OVERSIZED:
+            return None
+        if not by_user:
+            return list(by_role)
+        merged = {row["id"]: row for row in by_role}
+        merged.update((row["id"], row) for row in by_user)
+        return [merged[task_id] for task_id in sorted(merged)]
+
+    def invalidate(self, role=None, user_id=None):
+        keys = ([("role", role)] if role is not None else []) + ([("user", user_id)] if user_id is not None else [])
+        with self.lock:
+            for key in keys:
+                self.generations[key] = self.generations.get(key, 0) + 1
+        for key in keys:
+            self.backend.delete(key)
+        self.counters.inc("invalidations", len(keys))
+
+    def on_event(self, event):
+        self.invalidate(event.get("assignee_role"), event.get("assignee_user_id"))
+        if event.get("released_user_id") is not None:
+            self.invalidate(user_id=event["released_user_id"])
+
+    def snapshot(self) -> dict:
+        counters = self.counters.snapshot()
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            "size": self.backend.size(),
+            "maxsize": self.backend.maxsize,
+            **counters,
+            "hit_rate": round(counters["hits"] / lookups, 4) if lookups else None,
+        }
+
+
+worklist_cache = WorklistCache(
+    MemoryBackend(
+        maxsize=int(os.getenv("WORKLIST_CACHE_SIZE", "256")),
+        ttl=float(os.getenv("WORKLIST_CACHE_TTL", "60")),
+    ),
+    max_rows=int(os.getenv("WORKLIST_CACHE_MAX_ROWS", "5000")),
+)
+
+# Task events reach this listener on every worker, so each one drops its own copy
+task_events.add_listener(worklist_cache.on_event)
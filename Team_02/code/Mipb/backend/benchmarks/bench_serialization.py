@@ -0,0 +1,158 @@
+"""Serialization benchmark for GET /api/process/tasks/{user_id} and /history/{process_id}.
+
+Seeds a throwaway database, fetches the rows the endpoints fetch and times
+only the response rendering, per page of N tasks / history entries:
+
+  before      Row._asdict() / hand-built dicts, validated again by FastAPI's
+              response_model and rendered by JSONResponse (json.dumps)
+  orjson      same, rendered by ORJSONResponse (the new default response class)
+  attributes  pydantic from_attributes validation of the rows + dump_json
+  fast        row_dicts + json_response: no per-row validation, orjson
+              (what the two endpoints do now)
+
+    python -m benchmarks.bench_serialization [--sizes 100 1000 5000] [--repeat 20]
+"""
+import argparse
+import asyncio
+import datetime
+import statistics
+import time
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+from typing import List
+
+from app.db.models import Base, User, ProcessInstance, Task, HistoryLog
+from app.routers.process import TaskResponse, HistoryResponse, HISTORY_FIELDS
+from app.services.serialization import row_dicts, json_response
+from app.services.worklist_cache import pending_tasks_query
+
+PD_ROLE = "PD (Personnel Department)"
+VARIABLES = {"employee_name": "Benchmark", "is_academic": True, "days": 14, "final_decision": "Approved"}
+
+
+def seed(db, size):
+    user = User(username="penny.personnel", full_name="Penny Personnel", role_name=PD_ROLE)
+    db.add(user)
+    db.flush()
+    instance_ids = db.execute(
+        insert(ProcessInstance).returning(ProcessInstance.id, sort_by_parameter_order=True),
+        [{"process_definition_key": "leave_request", "requester_id": user.id, "status": "ACTIVE",
+          "variables": {**VARIABLES, "n": i}} for i in range(size)],
+    ).scalars().all()
+    now = datetime.datetime.utcnow()
+    db.execute(insert(Task), [
+        {"process_instance_id": instance_id, "task_definition_key": "Task_ReviewApplication_PD",
+         "name": "Review leave request (check entitlement)", "assignee_role": PD_ROLE, "status": "PENDING",
+         "due_at": now + datetime.timedelta(hours=48)}
+        for instance_id in instance_ids
+    ])
+    # One long history, as for an instance with many steps
+    db.execute(insert(HistoryLog), [
+        {"process_instance_id": instance_ids[0], "user_id": user.id, "user_name": user.full_name,
+         "action": "COMPLETE_TASK", "comment": "Completed Review leave request (check entitlement)",
+         "timestamp": now, "variables_delta": {"step": i, "final_decision": "Approved"}}
+        for i in range(size)
+    ])
+    db.commit()
+    return instance_ids[0]
+
+
+def median_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=20, help="runs per measurement (median reported)")
+    parser.add_argument("--url", default="sqlite://", help="throwaway database (tables are dropped)")
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    task_field = create_response_field(name="bench_tasks", type_=List[TaskResponse])
+    history_field = create_response_field(name="bench_history", type_=dict)
+
+    def fastapi_render(field, content, response_class):
+        # What FastAPI does with a returned value: validate + serialize via response_model, then render
+        value = loop.run_until_complete(serialize_response(field=field, response_content=content, is_coroutine=True))
+        return response_class(value).body
+
+    def old_task_dicts(rows):
+        return [row._asdict() for row in rows]
+
+    def old_history(logs, snapshots):
+        return {
+            "logs": [{
+                "action": log.action, "user_name": log.user_name, "comment": log.comment,
+                "timestamp": log.timestamp, "variables_delta": log.variables_delta,
+                "variables_snapshot": snapshots.get(log.id),
+            } for log in logs],
+            "final_variables": VARIABLES, "status": "ACTIVE", "next_cursor": None,
+        }
+
+    tasks_adapter = TypeAdapter(List[TaskResponse])
+    history_adapter = TypeAdapter(List[HistoryResponse])
+
+    def attributes(adapter, rows):
+        return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+    def new_history(logs, snapshots):
+        # get_history
+        return json_response({
+            "logs": [dict(zip(HISTORY_FIELDS, log[1:]), variables_snapshot=snapshots.get(log.id)) for log in logs],
+            "final_variables": VARIABLES, "status": "ACTIVE", "next_cursor": None,
+        }).body
+
+    print(f"{'endpoint':<8} {'rows':>6} | {'before ms':>9} {'orjson ms':>9} {'attributes ms':>13} {'fast ms':>8} | "
+          f"{'before ms/1k':>12} {'fast ms/1k':>10} {'speedup':>7}")
+    for size in args.sizes:
+        engine = create_engine(args.url)
+        Base.metadata.drop_all(engine)
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine)()
+        instance_id = seed(db, size)
+        rows = db.execute(pending_tasks_query().order_by(Task.id)).all()
+        logs = db.execute(select(HistoryLog.id, *(getattr(HistoryLog, field) for field in HISTORY_FIELDS))
+                          .where(HistoryLog.process_instance_id == instance_id).order_by(HistoryLog.id)).all()
+        snapshots = {log.id: {**VARIABLES, "step": i} for i, log in enumerate(logs)}
+
+        cases = {
+            "tasks": (
+                lambda: fastapi_render(task_field, old_task_dicts(rows), JSONResponse),
+                lambda: fastapi_render(task_field, old_task_dicts(rows), ORJSONResponse),
+                lambda: attributes(tasks_adapter, rows),
+                lambda: json_response(row_dicts(rows)).body,  # get_my_tasks
+            ),
+            "history": (
+                lambda: fastapi_render(history_field, old_history(logs, snapshots), JSONResponse),
+                lambda: fastapi_render(history_field, old_history(logs, snapshots), ORJSONResponse),
+                lambda: attributes(history_adapter, logs),  # without the snapshots
+                lambda: new_history(logs, snapshots),
+            ),
+        }
+        for name, (before, with_orjson, with_attributes, fast) in cases.items():
+            before_ms = median_ms(before, args.repeat)
+            orjson_ms = median_ms(with_orjson, args.repeat)
+            attributes_ms = median_ms(with_attributes, args.repeat)
+            fast_ms = median_ms(fast, args.repeat)
+            per_1k = 1000 / size
+            print(f"{name:<8} {size:>6} | {before_ms:>9.2f} {orjson_ms:>9.2f} {attributes_ms:>13.2f} {fast_ms:>8.2f} | "
+                  f"{before_ms * per_1k:>12.2f} {fast_ms * per_1k:>10.2f} {before_ms / fast_ms:>6.1f}x")
+        db.close()
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
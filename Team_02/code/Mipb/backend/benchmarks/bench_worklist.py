@@ -0,0 +1,92 @@
+"""Query-count benchmark for GET /api/process/tasks/{user_id}.
+
+Seeds N pending PD tasks into a throwaway database and counts the SQL
+statements one worklist read issues, for the current joined query and
+for the previous per-row lazy-loading version.
+
+    python -m benchmarks.bench_worklist [--sizes 10 100 1000] [--url sqlite://]
+"""
+import argparse
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Base, User, ProcessInstance, Task
+from app.routers.process import worklist_query
+
+PD_ROLE = "PD (Personnel Department)"
+
+
+def get_my_tasks(user_id, db):
+    # Same statement the endpoint runs (on the async session)
+    user = db.get(User, user_id)
+    return db.execute(worklist_query(user)).all()
+
+
+def lazy_worklist(user_id, db):
+    # Pre-fix implementation: one query, then a lazy load per task row
+    user = db.query(User).get(user_id)
+    tasks = db.query(Task).join(ProcessInstance).filter(
+        Task.status == "PENDING"
+    ).filter(
+        (Task.assignee_user_id == user_id) | (Task.assignee_role == user.role_name)
+    ).all()
+    return [(t.id, t.process_instance.process_definition_key, t.process_instance.variables) for t in tasks]
+
+
+def seed(db, size):
+    user = User(username="penny.personnel", full_name="Penny Personnel", role_name=PD_ROLE)
+    db.add(user)
+    db.flush()
+    for i in range(size):
+        instance = ProcessInstance(process_definition_key="leave_request", requester_id=user.id,
+                                   status="ACTIVE", variables={"days": i})
+        db.add(instance)
+        db.flush()
+        db.add(Task(process_instance_id=instance.id, task_definition_key="Task_ReviewApplication_PD",
+                    name="Review leave request (check entitlement)", assignee_role=PD_ROLE, status="PENDING"))
+    db.commit()
+    return user.id
+
+
+def measure(engine, fn, user_id):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    db = sessionmaker(bind=engine)()
+    try:
+        start = time.perf_counter()
+        rows = fn(user_id, db)
+        elapsed = time.perf_counter() - start
+    finally:
+        db.close()
+        event.remove(engine, "before_cursor_execute", listener)
+    return len(rows), len(statements), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--url", default="sqlite://", help="throwaway database (tables are dropped)")
+    args = parser.parse_args()
+
+    print(f"{'tasks':>7} | {'joined: queries':>15} {'ms':>8} | {'lazy: queries':>13} {'ms':>8}")
+    for size in args.sizes:
+        engine = create_engine(args.url)
+        Base.metadata.drop_all(engine)
+        Base.metadata.create_all(engine)
+        seed_db = sessionmaker(bind=engine)()
+        user_id = seed(seed_db, size)
+        seed_db.close()
+
+        rows, joined_queries, joined_time = measure(engine, get_my_tasks, user_id)
+        assert rows == size
+        _, lazy_queries, lazy_time = measure(engine, lazy_worklist, user_id)
+        print(f"{size:>7} | {joined_queries:>15} {joined_time * 1000:>8.1f} | {lazy_queries:>13} {lazy_time * 1000:>8.1f}")
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
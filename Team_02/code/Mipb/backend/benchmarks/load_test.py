@@ -0,0 +1,198 @@
+"""Load test: concurrent users walking leave, change-of-employment and decorations instances.
+
+Virtual users take the identities seeded by app/db/init_db.py (GET
+/api/auth/users). Requesters (Academic Teacher, Non-Academic Employee)
+start instances with a random is_academic; every other role reads its
+worklist and completes a random task from it, answering the Rector's
+decision with Accepted or Rejected. Reports p50/p95/p99 latency,
+throughput and error rate per endpoint; --max-p95-ms/--max-error-rate
+make it exit non-zero for release gating.
+
+Against a running backend (local Postgres via docker-compose):
+    python -m benchmarks.load_test --url http://localhost:8000 --users 500 --duration 60
+
+Offline, app in-process on a throwaway SQLite file as a stand-in:
+    python -m benchmarks.load_test --in-process --db sqlite:///loadtest.db --users 50
+
+Needs httpx (pip install httpx).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+
+import httpx
+
+REQUESTER_ROLES = {"Academic Teacher", "Non-Academic Employee"}
+PROCESS_KEYS = ("leave_request", "change_employment", "decorations")
+
+START = "POST /api/process/start"
+WORKLIST = "GET /api/process/tasks/{user_id}"
+COMPLETE = "POST /api/process/tasks/{task_id}/complete"
+
+
+def start_payload(process_key, rng):
+    # is_academic drives Gateway_IsAcademicTeacher in both leave and change-of-employment
+    data = {"employee_name": "Load Test", "is_academic": rng.random() < 0.5}
+    if process_key == "decorations":
+        data = {"employee_name": "Load Test", "decoration_type": "Medal"}
+    return data
+
+
+def completion_data(task, rng):
+    key = task["task_definition_key"]
+    if key == "Task_MakeDecision":  # decorations: Gateway_RKRDecision
+        return {"rkr_decision": rng.choice(["Accepted", "Rejected"])}
+    if key == "Task_ReceiveDecision":
+        return {"external_decision": rng.choice(["Przyznano", "Odmowa"])}
+    if key == "Task_EnterToRegister":
+        return {"award_grant_date": "2024-01-01"}
+    return {"load_test_step": key}
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(p / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    async def call(self, client, endpoint, method, path, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, **kwargs)
+            status = response.status_code
+        except Exception as e:  # transport errors and, in-process, anything the app raised
+            response, status = None, type(e).__name__
+        self.latencies[endpoint].append(time.perf_counter() - start)
+        self.statuses[endpoint][status] += 1
+        return response
+
+    def report(self, seconds):
+        rows = {}
+        for endpoint in (START, WORKLIST, COMPLETE):
+            latencies = sorted(self.latencies[endpoint])
+            statuses = self.statuses[endpoint]
+            total = sum(statuses.values())
+            # 409 = another user completed the task first: expected under contention, not an error
+            errors = sum(n for s, n in statuses.items() if not (isinstance(s, int) and (s < 400 or s == 409)))
+            rows[endpoint] = {
+                "requests": total,
+                "throughput_rps": round(total / seconds, 1) if seconds else None,
+                "p50_ms": round(percentile(latencies, 50) * 1000, 1) if latencies else None,
+                "p95_ms": round(percentile(latencies, 95) * 1000, 1) if latencies else None,
+                "p99_ms": round(percentile(latencies, 99) * 1000, 1) if latencies else None,
+                "error_rate": round(errors / total, 4) if total else 0.0,
+                "conflicts": statuses.get(409, 0),
+                "statuses": {str(s): n for s, n in sorted(statuses.items(), key=str)},
+            }
+        return rows
+
+
+async def virtual_user(client, stats, user, deadline, args, rng):
+    while time.monotonic() < deadline:
+        if user["role_name"] in REQUESTER_ROLES:
+            process_key = rng.choice(PROCESS_KEYS)
+            await stats.call(client, START, "POST", "/api/process/start", json={
+                "process_key": process_key, "user_id": user["id"], "initial_data": start_payload(process_key, rng),
+            })
+        else:
+            response = await stats.call(client, WORKLIST, "GET", f"/api/process/tasks/{user['id']}",
+                                        params={"limit": args.page_size})
+            tasks = response.json() if response is not None and response.status_code == 200 else []
+            if tasks:
+                task = rng.choice(tasks)  # spread users of one role over its queue
+                await stats.call(client, COMPLETE, "POST", f"/api/process/tasks/{task['id']}/complete",
+                                 json={"user_id": user["id"], "data": completion_data(task, rng)})
+        await asyncio.sleep(rng.uniform(0, args.think_time))
+
+
+async def run(client, args):
+    users = (await client.get("/api/auth/users")).raise_for_status().json()
+    if not users:
+        raise SystemExit("No users: seed the database with app/db/init_db.py first")
+    stats = Stats()
+    rng = random.Random(args.seed)
+    # Round-robin the seeded identities over the virtual users (many clerks share one role);
+    # requesters first so that even a handful of users starts instances
+    users.sort(key=lambda user: user["role_name"] not in REQUESTER_ROLES)
+    assigned = [users[i % len(users)] for i in range(args.users)]
+    start = time.monotonic()
+    deadline = start + args.duration
+    await asyncio.gather(*(
+        virtual_user(client, stats, user, deadline, args, random.Random(rng.random())) for user in assigned
+    ))
+    seconds = time.monotonic() - start
+    finished = Counter()
+    for status in ("COMPLETED", "REJECTED", "ACTIVE"):
+        response = await client.get("/api/process/instances", params={"status": status, "format": "ndjson"})
+        finished[status] = sum(1 for line in response.text.splitlines() if line.strip())
+    return stats.report(seconds), dict(finished), seconds
+
+
+async def main_async(args):
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    timeout = httpx.Timeout(args.timeout)
+    if not args.in_process:
+        async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=timeout) as client:
+            return await run(client, args)
+
+    os.environ["DATABASE_URL"] = args.db  # before the app (and its engines) are imported
+    from app.main import app
+
+    async with app.router.lifespan_context(app):  # create tables, seed users, compile BPMN
+        # An unhandled app error becomes a 500 in the report instead of aborting the run
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=timeout) as client:
+            return await run(client, args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--in-process", action="store_true", help="run the app in this process against --db")
+    parser.add_argument("--db", default="sqlite:///loadtest.db", help="DATABASE_URL for --in-process")
+    parser.add_argument("--users", type=int, default=500, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="seconds")
+    parser.add_argument("--think-time", type=float, default=0.5, help="max random pause between actions (s)")
+    parser.add_argument("--page-size", type=int, default=50, help="worklist page read by each user")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--max-p95-ms", type=float, help="fail if any endpoint's p95 is above this")
+    parser.add_argument("--max-error-rate", type=float, help="fail if any endpoint's error rate is above this")
+    args = parser.parse_args()
+
+    rows, instances, seconds = asyncio.run(main_async(args))
+
+    if args.json:
+        print(json.dumps({"seconds": round(seconds, 1), "users": args.users, "endpoints": rows,
+                          "instances": instances}, indent=2))
+    else:
+        print(f"{args.users} users, {seconds:.1f}s, instances {instances}")
+        print(f"{'endpoint':<44} {'requests':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7} {'409':>5}")
+        for endpoint, row in rows.items():
+            print(f"{endpoint:<44} {row['requests']:>8} {row['throughput_rps'] or 0:>8} {row['p50_ms'] or 0:>8} "
+                  f"{row['p95_ms'] or 0:>8} {row['p99_ms'] or 0:>8} {row['error_rate']:>7.2%} {row['conflicts']:>5}")
+
+    failed = [
+        endpoint for endpoint, row in rows.items()
+        if (args.max_p95_ms is not None and (row["p95_ms"] or 0) > args.max_p95_ms)
+        or (args.max_error_rate is not None and row["error_rate"] > args.max_error_rate)
+    ]
+    if failed:
+        print(f"Thresholds exceeded: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()